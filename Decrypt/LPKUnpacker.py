@@ -5,8 +5,13 @@ import json
 import logging
 import os
 import re
+from collections import OrderedDict
+from fnmatch import fnmatch
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from hashlib import md5
-from typing import Tuple
+from typing import List, Tuple
 
 import filetype
 from filetype.types import Type
@@ -35,14 +40,79 @@ def genkey(s: str) -> int:
         ret = ret | 0xffffffff00000000
     return ret
 
+# the LCG state is reset to key at the start of every 1024-byte slice,
+# so the keystream is one fixed pad repeated over the whole payload
+KEYSTREAM_PERIOD = 1024
+# xor block size, must stay a multiple of KEYSTREAM_PERIOD
+XOR_BLOCK = KEYSTREAM_PERIOD * 1024
+
+def keystream(key: int) -> bytes:
+    pad = bytearray(KEYSTREAM_PERIOD)
+    tmpkey = key
+    for i in range(KEYSTREAM_PERIOD):
+        tmpkey = (65535 & 2531011 + 214013 * tmpkey >> 16) & 0xffffffff
+        pad[i] = tmpkey & 0xff
+    return bytes(pad)
+
+@lru_cache(maxsize=8)
+def _block_mask(pad: bytes) -> int:
+    return int.from_bytes(pad * (XOR_BLOCK // len(pad)), "little")
+
+def xor_pad(pad: bytes, data: bytes) -> bytes:
+    '''
+    XOR ``data`` with ``pad`` repeated, ``data`` must start on a keystream period boundary.
+
+    Works block by block on big ints so the xor runs at C speed.
+    '''
+    size = len(data)
+    if size == 0:
+        return b""
+    view = memoryview(data)
+    out = bytearray(size)
+    for off in range(0, size, XOR_BLOCK):
+        chunk = view[off:off + XOR_BLOCK]
+        n = len(chunk)
+        if n == XOR_BLOCK:
+            mask = _block_mask(pad)
+        else:
+            mask = int.from_bytes((pad * (n // len(pad) + 1))[:n], "little")
+        out[off:off + n] = (int.from_bytes(chunk, "little") ^ mask).to_bytes(n, "little")
+    return bytes(out)
+
 def decrypt(key: int, data: bytes) -> bytes:
-    ret = []
-    for slice in [data[i:i+1024] for i in range(0, len(data), 1024)]:
-        tmpkey = key
-        for i in slice:
-            tmpkey = (65535 & 2531011 + 214013 * tmpkey >> 16) & 0xffffffff
-            ret.append((tmpkey & 0xff) ^ i)
-    return bytes(ret)
+    return xor_pad(keystream(key), data)
+
+class KeystreamCache():
+    '''
+    LRU cache of keystream pads keyed by ``genkey`` result, bounded in bytes.
+    '''
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.pads = OrderedDict()
+
+    def get(self, key: int) -> bytes:
+        pad = self.pads.get(key)
+        if pad is not None:
+            self.hits += 1
+            self.pads.move_to_end(key)
+            return pad
+        self.misses += 1
+        pad = keystream(key)
+        self.pads[key] = pad
+        self.size += len(pad)
+        while self.size > self.max_bytes and self.pads:
+            _, old = self.pads.popitem(last=False)
+            self.size -= len(old)
+        return pad
+
+    def stats(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {len(self.pads)} pads ({self.size} bytes)"
+
+# shared by every LpkLoader in this process
+keystream_cache = KeystreamCache()
 
 match_rule = re.compile(r"[0-9a-f]{32}.bin3?")
 def is_encrypted_file(s: str) -> bool:
@@ -56,6 +126,29 @@ def find_encrypted_file(s: str) -> str:
         return None
     return files[0]
 
+def parse_command(cmd: str) -> Tuple[str, str]:
+    '''
+    Parse one motion command, returns ("change_model" | "change_cos" | "file", target) or (None, None).
+    '''
+    lower_cmd = cmd.lower()
+
+    if lower_cmd.startswith("change_model"):
+        target = cmd[len("change_model"):].strip().strip('\"\'')
+        if target:
+            target = target.split()[0]
+        fallback = find_encrypted_file(cmd)
+        target_file = target if target else fallback
+        if target_file:
+            return "change_model", target_file
+
+    enc_file = find_encrypted_file(cmd)
+    if enc_file == None:
+        return None, None
+
+    if lower_cmd.startswith("change_cos"):
+        return "change_cos", enc_file
+    return "file", enc_file
+
 def travels_dict(dic: dict):
     for k in dic:
         if type(dic[k]) == dict:
@@ -97,31 +190,203 @@ class Moc(Type):
     def match(self, buf):
         return len(buf) > 3 and buf.startswith(b"moc")
 
-filetype.add_type(Moc3())
-filetype.add_type(Moc())
+def looks_like_json(data: bytes) -> bool:
+    try:
+        text = data.decode("utf8", errors="strict")
+    except UnicodeDecodeError as e:
+        # a multi-byte character may be cut at the end of the prefix
+        if e.start < len(data) - 3:
+            return False
+        text = data[:e.start].decode("utf8")
+    text = text.lstrip("\ufeff \t\r\n")
+    if text[:1] not in ("{", "["):
+        return False
+    # the next token must be plausible too, so INI sections like "[General]" don't count
+    following = text[1:].lstrip(" \t\r\n")[:1]
+    if text[0] == "{":
+        return following in ('"', "}")
+    return following != "" and following in '{["]-0123456789'
+
+class Json(Type):
+    MIME = "application/json"
+    EXTENSION = "json"
+    def __init__(self):
+        super(Json, self).__init__(mime=Json.MIME, extension=Json.EXTENSION)
+
+    def match(self, buf):
+        return looks_like_json(buf)
+
+class Physics3Json(Type):
+    MIME = "application/json"
+    EXTENSION = "physics3.json"
+    def __init__(self):
+        super(Physics3Json, self).__init__(mime=Physics3Json.MIME, extension=Physics3Json.EXTENSION)
+
+    def match(self, buf):
+        return b'"PhysicsSettingCount"' in buf and looks_like_json(buf)
+
+class Motion3Json(Type):
+    MIME = "application/json"
+    EXTENSION = "motion3.json"
+    def __init__(self):
+        super(Motion3Json, self).__init__(mime=Motion3Json.MIME, extension=Motion3Json.EXTENSION)
+
+    def match(self, buf):
+        return b'"CurveCount"' in buf and looks_like_json(buf)
+
+spine_atlas_rule = re.compile(rb"\A\s*[^\r\n]+\.(?:png|jpg|jpeg|webp)\r?\n\s*(?:size|format|filter|repeat|pma|scale)\s*:", re.I)
+class SpineAtlas(Type):
+    MIME = "text/x-spine-atlas"
+    EXTENSION = "atlas"
+    def __init__(self):
+        super(SpineAtlas, self).__init__(mime=SpineAtlas.MIME, extension=SpineAtlas.EXTENSION)
+
+    def match(self, buf):
+        return spine_atlas_rule.match(buf) is not None
+
+spine_version_rule = re.compile(rb"[34]\.\d+\.\d+[\w.-]*")
+spine_hash_rule = re.compile(rb"[\x21-\x7e]{0,64}")
+
+def read_spine_string(buf: bytes, pos: int):
+    '''
+    Read a Spine binary string: varint (length + 1, 0 meaning null) followed by utf8 bytes.
+    Returns (bytes or None, next position), or (None, -1) when the buffer is too short.
+    '''
+    value = shift = 0
+    for i in range(5):
+        if pos + i >= len(buf):
+            return None, -1
+        b = buf[pos + i]
+        value |= (b & 0x7F) << shift
+        shift += 7
+        if not b & 0x80:
+            break
+    else:
+        return None, -1
+    pos += i + 1
+    if value == 0:
+        return None, pos
+    end = pos + value - 1
+    if end > len(buf):
+        return None, -1
+    return buf[pos:end], end
+
+class SpineSkel(Type):
+    MIME = "application/x-spine-skel"
+    EXTENSION = "skel"
+    def __init__(self):
+        super(SpineSkel, self).__init__(mime=SpineSkel.MIME, extension=SpineSkel.EXTENSION)
+
+    def match(self, buf):
+        # 3.x: string hash, string version
+        hash_str, pos = read_spine_string(buf, 0)
+        if pos > 0 and (hash_str is None or spine_hash_rule.fullmatch(hash_str)):
+            version, _ = read_spine_string(buf, pos)
+            if version is not None and spine_version_rule.fullmatch(version):
+                return True
+        # 4.x: 8 byte hash, string version
+        version, _ = read_spine_string(buf, 8)
+        return version is not None and spine_version_rule.fullmatch(version) is not None
+
+# bytes of the decrypted payload used to pick a suffix
+SNIFF_SIZE = 8192
+# checked in order on the SNIFF_SIZE prefix, before and after filetype's own magic numbers
+signatures = [Moc3(), Moc(), Physics3Json(), Motion3Json(), SpineAtlas()]
+fallback_signatures = [SpineSkel(), Json()]
 
 def guess_type(data: bytes):
-    ftype = filetype.guess(data)
+    '''
+    Guess the suffix of a decrypted payload from its first SNIFF_SIZE bytes.
+    '''
+    head = bytes(data[:SNIFF_SIZE])
+    ftype = filetype.match(head, signatures) or filetype.guess(head) or filetype.match(head, fallback_signatures)
     if ftype != None:
         return "." + ftype.extension
-    try:
-        json.loads(data.decode("utf8"))
-        return ".json"
-    except:
-        return ""
+    return ""
+
+def stream_decrypt(lpkfile: zipfile.ZipFile, filename: str, pad: bytes, output: str, sniff: bool) -> Tuple[str, int]:
+    '''
+    Decrypt a member to ``output`` in XOR_BLOCK chunks without loading it into memory.
+
+    The suffix is sniffed from the first chunk only. Returns (suffix, decrypted size).
+    '''
+    size = lpkfile.getinfo(filename).file_size
+    with lpkfile.open(filename) as src:
+        head = xor_pad(pad, src.read(XOR_BLOCK))
+        suffix = guess_type(head) if sniff else ""
+        with open(output + suffix, "wb") as dst:
+            dst.write(head)
+            while True:
+                chunk = src.read(XOR_BLOCK)
+                if not chunk:
+                    break
+                dst.write(xor_pad(pad, chunk))
+    return suffix, size
 
 
 # -------------------- LpkLoader (merged) --------------------
 logger = logging.getLogger("lpkLoder")
 
+# steam app id of Live2DViewerEX, its workshop items are workshop/content/616720/<fileId>
+WORKSHOP_APPID = "616720"
+
+# written into each output directory to skip unchanged members on the next run
+MANIFEST_NAME = ".manifest.json"
+
+# per-process zip handle used by decrypt workers
+_worker_lpkfile = None
+
+def _init_worker(lpkpath: str):
+    global _worker_lpkfile
+    _worker_lpkfile = zipfile.ZipFile(lpkpath)
+
+def _decrypt_member(job: Tuple[str, int, str, bool]) -> Tuple[str, int]:
+    '''
+    Decrypt one member in a worker process and write it to ``output``.
+
+    Returns the suffix appended to ``output`` (empty if ``sniff`` is false) and the decrypted size.
+    '''
+    filename, key, output, sniff = job
+    suffix, size = stream_decrypt(_worker_lpkfile, filename, keystream_cache.get(key), output, sniff)
+    print(f"recovering {filename} -> {output+suffix}")
+    return suffix, size
+
 class LpkLoader():
-    def __init__(self, lpkpath, configpath) -> None:
+    def __init__(self, lpkpath, configpath, workers: int = 1, interactive: bool = True, workshop: List[str] = None,
+                 characters: List[str] = None, costumes: List[str] = None) -> None:
         self.lpkpath = lpkpath
         self.configpath = configpath
+        # glob patterns of character names / costume indexes or names to extract, None for all
+        self.characters = characters
+        self.costumes = costumes
+        # extra steam workshop/content/616720 dirs to search for fileIds
+        self.workshop = workshop or []
+        self.fileid_verified = False
+        self.fileid_cache = None
+        # extraction manifest: member -> crc, size, key and output paths of the last run
+        self.outputdir = None
+        self.members = {}
+        self.reused = 0
+        self.workers = workers
+        # batch workers must never block on stdin
+        self.interactive = interactive
+        self.decrypted_bytes = 0
         self.lpkType = None
         self.encrypted = "true"
         self.trans = {}
+        # subset of trans whose keys match_rule does not cover (plain change_model targets)
+        self.plain_trans = {}
         self.entrys = {}
+        # entrys with encrypted names already substituted
+        self.rewritten = {}
+        # (subdir, name) of entrys already written
+        self.written = set()
+        # members collected for the process pool when workers > 1
+        self.pending: List[Tuple[str, str, str]] = []
+        self.queued = set()
+        # process pool shared by every flush of one extract(), started on first use
+        self.pool = None
+        self.keycache = keystream_cache
         self.load_lpk()
     
     def load_lpk(self):
@@ -150,25 +415,46 @@ class LpkLoader():
         self.config = json.loads(open(self.configpath, "r", encoding="utf8").read())
     
     def extract(self, outputdir: str):
+        self.outputdir = outputdir
+        self.load_manifest()
+        try:
+            self._extract(outputdir)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+            self.save_manifest()
+            logger.debug(f"keystream cache: {self.keycache.stats()}")
+            if self.reused:
+                print(f"reused {self.reused} unchanged members from {MANIFEST_NAME}")
+
+    def _extract(self, outputdir: str):
+        self.fileid_cache = os.path.join(outputdir, ".fileid")
         if self.lpkType in ["STD2_0", "STM_1_0"]:
             for chara in self.mlve_config["list"]:
-                if self.lpkType == "STM_1_0" and hasattr(self, 'config') and 'title' in self.config:
-                    chara_name = self.config["title"]
-                else:
-                    chara_name = chara["character"] if chara["character"] != "" else "character"
+                chara_name = self.chara_name(chara)
+                if not self.select_chara(chara, chara_name):
+                    continue
                 subdir =  os.path.join(outputdir, normalize(chara_name))
                 safe_mkdir(subdir)
 
                 for i in range(len(chara["costume"])):
+                    if not self.select_costume(i, chara["costume"][i]):
+                        continue
                     logger.info(f"extracting {chara_name}_costume_{i}")
                     self.extract_costume(chara["costume"][i], subdir)
 
+                self.flush_pending()
+
                 # replace encryped filename to decrypted filename in entrys(model.json)
                 for name in self.entrys:
-                    out_s: str = self.entrys[name]
-                    for k in self.trans:
-                        out_s = out_s.replace(k, self.trans[k])
-                    open(os.path.join(subdir, name), "w", encoding="utf8").write(out_s)
+                    # STM_1_0 maps every character to the same subdir
+                    if (subdir, name) in self.written:
+                        continue
+                    if name not in self.rewritten:
+                        self.rewritten[name] = self.translate(self.entrys[name])
+                    open(os.path.join(subdir, name), "w", encoding="utf8").write(self.rewritten[name])
+                    self.written.add((subdir, name))
         else:
             try:
                 print("Deprecated/unknown lpk format detected. Attempting with STD_1_0 format...")
@@ -179,6 +465,7 @@ class LpkLoader():
                     self.lpkfile.extractall(outputdir)
                     return
                 # For STD_1_0 and earlier
+                jobs = []
                 for file in self.lpkfile.namelist():
                     if os.path.splitext(file)[-1] == '':
                         continue
@@ -188,15 +475,82 @@ class LpkLoader():
                     if os.path.splitext(file)[-1] in [".json", ".mlve", ".txt"]:
                         print(f"Extracting {file} -> {outputFilePath}")
                         self.lpkfile.extract(file, outputdir)
+                    elif self.reuse_member(file, outputFilePath) is not None:
+                        continue
+                    elif self.workers > 1:
+                        jobs.append((file, self.getkey(file), outputFilePath, False))
                     else:
                         print(f"Decrypting {file} -> {outputFilePath}")
-                        decryptedData = self.decrypt_file(file)
-                        with open(outputFilePath, "wb") as outputFile:
-                            outputFile.write(decryptedData)
+                        self.decrypt_member(file, outputFilePath, False)
+                if jobs:
+                    self.run_jobs(jobs)
             except Exception as e:
                 logger.fatal(f"Failed to decrypt {self.lpkpath}, possibly wrong/unsupported format: {e}")
                 raise
     
+    def chara_name(self, chara: dict) -> str:
+        if self.lpkType == "STM_1_0" and hasattr(self, 'config') and 'title' in self.config:
+            return self.config["title"]
+        return chara["character"] if chara["character"] != "" else "character"
+
+    def select_chara(self, chara: dict, chara_name: str) -> bool:
+        if not self.characters:
+            return True
+        names = [chara_name, chara["character"]]
+        return any(fnmatch(n, p) for n in names for p in self.characters)
+
+    def select_costume(self, index: int, costume: dict) -> bool:
+        if not self.costumes:
+            return True
+        names = [str(index), costume.get("name", ""), costume["path"]]
+        return any(fnmatch(n, p) for n in names if n for p in self.costumes)
+
+    def list_models(self):
+        '''
+        Print the costume / model dependency graph, only model JSONs are decrypted.
+        '''
+        if self.lpkType not in ["STD2_0", "STM_1_0"]:
+            print(f"{self.lpkpath}: listing is not supported for lpk type {self.lpkType}")
+            return
+        print(self.lpkpath)
+        for chara in self.mlve_config["list"]:
+            chara_name = self.chara_name(chara)
+            if not self.select_chara(chara, chara_name):
+                continue
+            print(f"  {chara_name}")
+            for i in range(len(chara["costume"])):
+                costume = chara["costume"][i]
+                if costume["path"] == "" or not self.select_costume(i, costume):
+                    continue
+                self.check_decrypt(costume["path"])
+                label = f" {costume['name']}" if costume.get("name") else ""
+                print(f"    costume {i}{label}:")
+                self.print_model(costume["path"], 3, set())
+
+    def print_model(self, model_json: str, depth: int, seen: set):
+        indent = "  " * depth
+        if model_json in seen:
+            print(f"{indent}{model_json} (see above)")
+            return
+        seen.add(model_json)
+        entry = json.loads(self.decrypt_file(model_json).decode(encoding="utf8"))
+        links = []
+        files = set()
+        for name, val in travels_dict(entry):
+            if (name.lower().endswith("_command") or name.lower().endswith("_postcommand")) and val:
+                for cmd in [c.strip() for c in val.split(";") if c.strip()]:
+                    kind, target = parse_command(cmd)
+                    if kind in ("change_model", "change_cos"):
+                        links.append((kind, target))
+                    elif kind == "file":
+                        files.add(target)
+            if is_encrypted_file(val):
+                files.add(val)
+        print(f"{indent}{model_json} ({len(files)} files)")
+        for kind, target in links:
+            print(f"{indent}  {kind} ->")
+            self.print_model(target, depth + 2, seen)
+
     def extract_costume(self, costume: dict, dir: str):
         if costume["path"] == "":
             return
@@ -222,7 +576,7 @@ class LpkLoader():
 
         self.entrys[f"model{id}.json"] = out_s
 
-        self.trans[model_json] = f"model{id}.json"
+        self.set_trans(model_json, f"model{id}.json")
 
         logger.debug(f"model{id}.json:\n{entry}")
 
@@ -232,42 +586,28 @@ class LpkLoader():
             if (name.lower().endswith("_command") or name.lower().endswith("_postcommand")) and val:
                 commands = [c.strip() for c in val.split(";") if c.strip()]
                 for cmd in commands:
-                    lower_cmd = cmd.lower()
-
-                    if lower_cmd.startswith("change_model"):
-                        target = cmd[len("change_model"):].strip().strip('\"\'')
-                        if target:
-                            target = target.split()[0]
-                        fallback = find_encrypted_file(cmd)
-                        target_file = target if target else fallback
-                        if target_file:
-                            self.extract_model_json(target_file, dir)
-                            continue
-
-                    enc_file = find_encrypted_file(cmd)
-                    if enc_file == None:
+                    kind, enc_file = parse_command(cmd)
+                    if kind == None:
                         continue
 
-                    if lower_cmd.startswith("change_cos"):
+                    if kind in ("change_model", "change_cos"):
                         self.extract_model_json(enc_file, dir)
                     else:
                         name += f"_{id}"
                         name = self.name_change(name)
-                        _, suffix = self.recovery(enc_file, os.path.join(subdir, name))
-                        self.trans[enc_file] = name + suffix
+                        self.recover_member(enc_file, subdir, name)
 
 
             if is_encrypted_file(val):
                 enc_file = val
                 # already decrypted
-                if enc_file in self.trans:
+                if enc_file in self.trans or enc_file in self.queued:
                     continue
                 # recover regular files
                 else:
                     name += f"_{id}"
                     name = self.name_change(name)
-                    _, suffix = self.recovery(enc_file, os.path.join(subdir, name))
-                    self.trans[enc_file] = name + suffix
+                    self.recover_member(enc_file, subdir, name)
         
         logger.debug(f"========= end of model {model_json} =========")
 
@@ -276,44 +616,204 @@ class LpkLoader():
         '''
         Check if decryption work.
 
-        If lpk earsed fileId in config.json, this function will automatically try to use lpkFile as fileId.
-        If all attemptions failed, this function will read fileId from ``STDIN``.
+        If lpk earsed fileId in config.json, this function will probe candidate fileIds
+        (lpkFile, parent directory names, workshop folders) on the first keystream block.
+        The verified fileId is cached per pack. If all attemptions failed, this function will read fileId from ``STDIN``.
         '''
 
+        if self.fileid_verified:
+            return
+
         logger.info("try to decrypt entry model.json")
 
+        if self.lpkType != "STM_1_0" or self.mlve_config["encrypt"] != "true":
+            self.decrypt_file(filename).decode(encoding="utf8")
+            return
+
+        head = self.read_head(filename)
+        for fileid in self.possible_fileids():
+            if not self.probe_fileid(filename, head, fileid):
+                continue
+            self.config["fileId"] = fileid
+            try:
+                self.decrypt_file(filename).decode(encoding="utf8")
+            except UnicodeDecodeError:
+                continue
+            logger.info(f"verified fileId {fileid}")
+            self.remember_fileid(fileid)
+            return
+
+        if not self.interactive:
+            raise ValueError("fileId auto fix failed and stdin is disabled in batch mode")
+        print("steam workshop fileid is usually a foler under PATH_TO_YOUR_STEAM/steamapps/workshop/content/616720/([0-9]+)")
+        fileid = input("auto fix failed, please input fileid manually: ")
+        self.config["fileId"] = fileid
         try:
             self.decrypt_file(filename).decode(encoding="utf8")
         except UnicodeDecodeError:
-            logger.info("trying to auto fix fileId")
-            success = False
-            possible_fileId = []
-            possible_fileId.append(self.config["lpkFile"].strip('.lpk'))
-            for fileid in possible_fileId:
-                self.config["fileId"] = fileid
-                try:
-                    self.decrypt_file(filename).decode(encoding="utf8")
-                except UnicodeDecodeError:
-                    continue
+            logger.fatal("decrypt failed!")
+            raise
+        self.remember_fileid(fileid)
 
-                success = True
-                break
-            if not success:
-                print("steam workshop fileid is usually a foler under PATH_TO_YOUR_STEAM/steamapps/workshop/content/616720/([0-9]+)")
-                fileid = input("auto fix failed, please input fileid manually: ")
-                self.config["fileId"] = fileid
-                try:
-                    self.decrypt_file(filename).decode(encoding="utf8")
-                except UnicodeDecodeError:
-                    logger.fatal("decrypt failed!")
-                    raise
-
-    def recovery(self, filename, output) -> Tuple[bytes, str]:
-        ret = self.decrypt_file(filename)
-        suffix = guess_type(ret)
+    def read_head(self, filename: str) -> bytes:
+        with self.lpkfile.open(filename) as f:
+            return f.read(KEYSTREAM_PERIOD)
+
+    def probe_fileid(self, filename: str, head: bytes, fileid: str) -> bool:
+        '''
+        Decrypt only the first keystream block of ``filename`` with ``fileid`` and check for a json prefix.
+        '''
+        key = genkey(self.mlve_config["id"] + fileid + filename + self.config["metaData"])
+        return looks_like_json(xor_pad(keystream(key), head))
+
+    def possible_fileids(self) -> List[str]:
+        candidates = [self.config.get("fileId", "")]
+        if self.fileid_cache and os.path.isfile(self.fileid_cache):
+            candidates.append(open(self.fileid_cache, "r", encoding="utf8").read().strip())
+        if self.config.get("lpkFile"):
+            candidates.append(os.path.splitext(self.config["lpkFile"])[0])
+            candidates.append(self.config["lpkFile"].strip('.lpk'))
+        # workshop items live in workshop/content/616720/<fileId>/
+        parents = []
+        d = os.path.dirname(os.path.abspath(self.lpkpath))
+        while os.path.basename(d):
+            parents.append(os.path.basename(d))
+            d = os.path.dirname(d)
+        candidates.extend(parents)
+        for workshop in self.workshop_dirs():
+            try:
+                candidates.extend(e.name for e in os.scandir(workshop) if e.is_dir())
+            except OSError as e:
+                logger.info(f"failed to scan workshop dir {workshop}: {e}")
+        seen = set()
+        return [c for c in candidates if c and not (c in seen or seen.add(c))]
+
+    def workshop_dirs(self) -> List[str]:
+        dirs = list(self.workshop)
+        d = os.path.dirname(os.path.abspath(self.lpkpath))
+        while os.path.basename(d):
+            if os.path.basename(d) == WORKSHOP_APPID and os.path.basename(os.path.dirname(d)) == "content":
+                dirs.append(d)
+            d = os.path.dirname(d)
+        return dirs
+
+    def remember_fileid(self, fileid: str):
+        self.fileid_verified = True
+        if self.fileid_cache:
+            open(self.fileid_cache, "w", encoding="utf8").write(fileid)
+
+    def recover_member(self, enc_file: str, subdir: str, name: str):
+        '''
+        Recover ``enc_file`` as ``subdir/name`` now, or queue it for the process pool.
+        '''
+        suffix = self.reuse_member(enc_file, os.path.join(subdir, name))
+        if suffix is not None:
+            self.set_trans(enc_file, name + suffix)
+            return
+        if self.workers > 1:
+            self.pending.append((enc_file, subdir, name))
+            self.queued.add(enc_file)
+            return
+        suffix = self.recovery(enc_file, os.path.join(subdir, name))
+        self.set_trans(enc_file, name + suffix)
+
+    def flush_pending(self):
+        '''
+        Decrypt every queued member in parallel, then fill ``self.trans`` in queue order
+        so the result matches a serial run.
+        '''
+        if not self.pending:
+            return
+        jobs = [(enc_file, self.getkey(enc_file), os.path.join(subdir, name), True)
+                for enc_file, subdir, name in self.pending]
+        suffixes = self.run_jobs(jobs)
+        for (enc_file, _, name), suffix in zip(self.pending, suffixes):
+            self.set_trans(enc_file, name + suffix)
+        self.pending = []
+        self.queued = set()
+
+    def run_jobs(self, jobs: List[Tuple[str, int, str, bool]]) -> List[str]:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.lpkpath,))
+        results = list(self.pool.map(_decrypt_member, jobs, chunksize=4))
+        for (filename, key, output, _), (suffix, size) in zip(jobs, results):
+            self.record_member(filename, key, output + suffix)
+            self.decrypted_bytes += size
+        return [suffix for suffix, _ in results]
+
+    def recovery(self, filename, output) -> str:
+        suffix = self.decrypt_member(filename, output, True)
         print(f"recovering {filename} -> {output+suffix}")
-        open(output + suffix, "wb").write(ret)
-        return ret, suffix
+        return suffix
+
+    def decrypt_member(self, filename: str, output: str, sniff: bool) -> str:
+        key = self.getkey(filename)
+        suffix, size = stream_decrypt(self.lpkfile, filename, self.keycache.get(key), output, sniff)
+        self.decrypted_bytes += size
+        self.record_member(filename, key, output + suffix)
+        return suffix
+
+    def load_manifest(self):
+        path = os.path.join(self.outputdir, MANIFEST_NAME)
+        if not os.path.isfile(path):
+            return
+        try:
+            manifest = json.loads(open(path, "r", encoding="utf8").read())
+        except ValueError as e:
+            logger.info(f"ignoring broken manifest {path}: {e}")
+            return
+        if manifest.get("type") == self.lpkType:
+            self.members = manifest.get("members", {})
+            # manifests of older versions kept a single "output" per member
+            for entry in self.members.values():
+                if "outputs" not in entry:
+                    entry["outputs"] = [entry.pop("output")] if "output" in entry else []
+
+    def save_manifest(self):
+        if self.outputdir is None or not self.members:
+            return
+        manifest = {"lpk": os.path.basename(self.lpkpath), "type": self.lpkType, "members": self.members}
+        open(os.path.join(self.outputdir, MANIFEST_NAME), "w", encoding="utf8").write(json.dumps(manifest, ensure_ascii=False, indent=1))
+
+    def record_member(self, filename: str, key: int, output: str):
+        info = self.lpkfile.getinfo(filename)
+        output = os.path.relpath(output, self.outputdir).replace("\\", "/")
+        old = self.members.get(filename)
+        # a member can be written under several names (e.g. FileReferences and a motion Command)
+        if old and (old["crc"], old["size"], old["key"]) == (info.CRC, info.file_size, key):
+            if output not in old["outputs"]:
+                old["outputs"].append(output)
+            return
+        self.members[filename] = {
+            "crc": info.CRC,
+            "size": info.file_size,
+            "key": key,
+            "outputs": [output],
+        }
+
+    def reuse_member(self, filename: str, output: str) -> str:
+        '''
+        Return the suffix of the previous output of ``filename`` if the member, its key and
+        the output file are unchanged since the last run, otherwise None.
+        '''
+        old = self.members.get(filename)
+        if old is None or self.outputdir is None:
+            return None
+        info = self.lpkfile.getinfo(filename)
+        if old["crc"] != info.CRC or old["size"] != info.file_size or old["key"] != self.getkey(filename):
+            return None
+        base = os.path.relpath(output, self.outputdir).replace("\\", "/")
+        for previous in old.get("outputs", []):
+            suffix = previous[len(base):]
+            if not previous.startswith(base) or (suffix and not suffix.startswith(".")):
+                continue
+            path = os.path.join(self.outputdir, previous)
+            if not os.path.isfile(path) or os.path.getsize(path) != info.file_size:
+                continue
+            self.reused += 1
+            return suffix
+        return None
 
     def getkey(self, file: str):
         if self.lpkType == "STM_1_0" and self.mlve_config["encrypt"] != "true":
@@ -329,12 +829,28 @@ class LpkLoader():
 
     def decrypt_file(self, filename) -> bytes:
         data = self.lpkfile.read(filename)
+        self.decrypted_bytes += len(data)
         return self.decrypt_data(filename, data)
 
     def decrypt_data(self, filename: str, data: bytes) -> bytes:
         key = self.getkey(filename)
-        return decrypt(key, data)
+        return xor_pad(self.keycache.get(key), data)
     
+    def set_trans(self, enc_file: str, name: str):
+        self.trans[enc_file] = name
+        if not is_encrypted_file(enc_file):
+            self.plain_trans[enc_file] = name
+
+    def translate(self, s: str) -> str:
+        '''
+        Substitute every encrypted name in ``s`` with its entry in ``self.trans`` in one regex pass.
+        '''
+        out_s = match_rule.sub(lambda m: self.trans.get(m.group(0), m.group(0)), s)
+        # change_model targets may be plain names that match_rule does not cover
+        for k, v in self.plain_trans.items():
+            out_s = out_s.replace(k, v)
+        return out_s
+
     def name_change(self, name: str) -> str:
         # remove FileReferences_ and normalize slashes
         name = name.replace("FileReferences_", "")
@@ -349,10 +865,56 @@ def build_arg_parser():
     # If not provided, default will be the script's directory under an `output` subfolder
     parser.add_argument("output_dir", nargs='?', default=None, help="directory to store result (default: script_dir/output)")
     parser.add_argument("-c", "--config", help="(optional) override config.json for STM_1_0 packs (if not provided, script will look for config.json next to each .lpk)")
+    parser.add_argument("--workshop", action="append", default=[], help="steam workshop/content/616720 dir to search for fileIds (repeatable)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="decrypt members of each lpk in N processes (default: 1, serial)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="process N lpk files at once, one process per pack (default: 1)")
+    parser.add_argument("--character", action="append", help="only extract characters matching this name or glob (repeatable)")
+    parser.add_argument("--costume", action="append", help="only extract costumes matching this index, name or glob (repeatable)")
+    parser.add_argument("-l", "--list", action="store_true", help="print the costume/model graph of each lpk without extracting")
     parser.add_argument("-v", "--verbosity", action="count", default=0, help="increase output verbosity")
     return parser
 
 
+def process_pack(lpk: str, per_out: str, config_path: str, list_only: bool = False, **loader_args) -> dict:
+    '''
+    Extract (or list) one lpk and return its status, decrypted bytes and wall time for the summary table.
+    '''
+    result = {"lpk": lpk, "status": "ok", "bytes": 0, "reused": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        loader = LpkLoader(lpk, config_path, **loader_args)
+    except Exception as e:
+        print(f"Failed to initialize loader for {lpk}: {e}")
+        result["status"] = f"init failed: {e}"
+    else:
+        try:
+            if list_only:
+                loader.list_models()
+            else:
+                safe_mkdir(per_out)
+                loader.extract(per_out)
+        except Exception as e:
+            print(f"Failed to extract {lpk}: {e}")
+            result["status"] = f"failed: {e}"
+        result["bytes"] = loader.decrypted_bytes
+        result["reused"] = loader.reused
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def print_summary(results: List[dict]):
+    name_width = max([len(os.path.basename(r["lpk"])) for r in results] + [4])
+    print()
+    print(f"{'pack':<{name_width}}  {'MB':>10}  {'reused':>6}  {'time(s)':>8}  {'MB/s':>8}  status")
+    for r in results:
+        mb = r["bytes"] / 1024 / 1024
+        speed = mb / r["seconds"] if r["seconds"] > 0 else 0
+        print(f"{os.path.basename(r['lpk']):<{name_width}}  {mb:>10.2f}  {r['reused']:>6}  {r['seconds']:>8.2f}  {speed:>8.2f}  {r['status']}")
+    failed = sum(1 for r in results if r["status"] != "ok")
+    reused = sum(r["reused"] for r in results)
+    print(f"{len(results)} packs, {failed} failed, {reused} members reused")
+
+
 if __name__ == "__main__":
     parser = build_arg_parser()
     args = parser.parse_args()
@@ -388,11 +950,12 @@ if __name__ == "__main__":
     else:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         base_out = os.path.join(script_dir, 'output')
-        safe_mkdir(base_out)
+    loader_args = {"workers": args.workers, "workshop": args.workshop,
+                   "characters": args.character, "costumes": args.costume}
+    tasks = []
     for lpk in lpk_files:
         lpk_name = os.path.splitext(os.path.basename(lpk))[0]
         per_out = os.path.join(base_out, lpk_name)
-        safe_mkdir(per_out)
 
         # determine config: prefer user-supplied global config, otherwise look for config.json next to the lpk
         if args.config:
@@ -401,15 +964,26 @@ if __name__ == "__main__":
             maybe = os.path.join(os.path.dirname(lpk), 'config.json')
             config_path = maybe if os.path.isfile(maybe) else None
 
-        print(f"Processing: {lpk} -> {per_out} (config: {config_path})")
-        try:
-            loader = LpkLoader(lpk, config_path)
-        except Exception as e:
-            print(f"Failed to initialize loader for {lpk}: {e}")
-            continue
+        tasks.append((lpk, per_out, config_path))
 
-        try:
-            loader.extract(per_out)
-        except Exception as e:
-            print(f"Failed to extract {lpk}: {e}")
-            continue
+    results = []
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = {}
+            for lpk, per_out, config_path in tasks:
+                print(f"Queued: {lpk} -> {per_out} (config: {config_path})")
+                futures[pool.submit(process_pack, lpk, per_out, config_path, args.list, interactive=False, **loader_args)] = lpk
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # worker process died, keep collecting the others
+                    result = {"lpk": futures[future], "status": f"crashed: {e}", "bytes": 0, "reused": 0, "seconds": 0.0}
+                print(f"Finished: {result['lpk']} ({result['status']})")
+                results.append(result)
+    else:
+        for lpk, per_out, config_path in tasks:
+            print(f"Processing: {lpk} -> {per_out} (config: {config_path})")
+            results.append(process_pack(lpk, per_out, config_path, args.list, **loader_args))
+
+    print_summary(results)
@@ -0,0 +1,151 @@
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from dataclasses import asdict
+from typing import Dict, List, Any
+
+from YooAssetUnpacker import SUPPORTED_VERSIONS, YooAssetDeserializer
+from YooAssetManifestGen import generate_manifest
+
+
+# 解析方式 -> deserialize() 参数
+MODES = {
+    "objects": {},
+    "columnar": {"columnar": True},
+    "bundles-only": {"bundles_only": True},
+}
+
+
+def parse(data: bytes, mode: str):
+    return YooAssetDeserializer(data).deserialize(**MODES[mode])
+
+
+def check_modes(data: bytes) -> List[str]:
+    """确认三种解析方式的结果一致，返回不一致的项"""
+    expected = asdict(parse(data, "objects"))
+    mismatches = []
+    if asdict(parse(data, "columnar").to_manifest()) != expected:
+        mismatches.append("columnar: to_manifest() 与 objects 结果不一致")
+    bundle_list = [asdict(bundle) for bundle in parse(data, "bundles-only").bundle_list]
+    if bundle_list != expected["bundle_list"]:
+        mismatches.append("bundles-only: bundle_list 与 objects 结果不一致")
+    return mismatches
+
+
+def measure(data: bytes, mode: str, repeat: int, records: int) -> Dict[str, Any]:
+    """取 repeat 次中最快的一次计算吞吐，再单独跑一次用 tracemalloc 统计峰值内存
+
+    records 为清单中的资源数 + 资源包数；bundles-only 跳过的资源也计入，各方式的吞吐可以直接比较。
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        manifest = parse(data, mode)
+        best = min(best, time.perf_counter() - start)
+        del manifest
+
+    tracemalloc.start()
+    manifest = parse(data, mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del manifest
+
+    return {
+        "seconds": best,
+        "records_per_sec": records / best,
+        "mb_per_sec": len(data) / 1024 / 1024 / best,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """返回吞吐下降超过 tolerance 的项"""
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if not old:
+            continue
+        ratio = result["records_per_sec"] / old["records_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(f"{key}: {ratio:.0%} of baseline")
+    return regressions
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="YooAsset 清单解析基准测试")
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        choices=SUPPORTED_VERSIONS,
+        default=SUPPORTED_VERSIONS,
+        help="要测试的清单版本（默认全部）",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=list(MODES),
+        default=list(MODES),
+        help="解析方式（默认全部）",
+    )
+    parser.add_argument("--assets", type=int, default=100000, help="资源数量（默认 100000）")
+    parser.add_argument("--bundles", type=int, default=10000, help="资源包数量（默认 10000）")
+    parser.add_argument("--tags", type=int, default=8, help="标签池大小（默认 8）")
+    parser.add_argument("--fanout", type=int, default=4, help="每条记录最多的依赖数量（默认 4）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（默认 0）")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数，取最快一次（默认 3）")
+    parser.add_argument("-o", "--output", help="把结果保存为 JSON")
+    parser.add_argument("--baseline", help="与之前保存的结果对比，吞吐下降超过容差时返回非零")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="允许的吞吐下降比例（默认 0.1）"
+    )
+    return parser
+
+
+def main():
+
+    args = build_arg_parser().parse_args()
+
+    results = {}
+    print(f"{'版本':<12}{'方式':<14}{'耗时(s)':>10}{'记录/秒':>14}{'MB/秒':>10}{'峰值内存(MB)':>14}")
+    for version in args.versions:
+        data = generate_manifest(
+            version, args.assets, args.bundles, args.tags, args.fanout, args.seed
+        )
+        mismatches = check_modes(data)
+        if mismatches:
+            print(f"{version} 解析结果不一致:")
+            for line in mismatches:
+                print(f"  {line}")
+            sys.exit(1)
+        for mode in args.modes:
+            result = measure(
+                data, mode, max(1, args.repeat), args.assets + args.bundles
+            )
+            results[f"{version}/{mode}"] = result
+            print(
+                f"{version:<12}{mode:<14}{result['seconds']:>10.3f}"
+                f"{result['records_per_sec']:>14,.0f}{result['mb_per_sec']:>10.1f}"
+                f"{result['peak_mb']:>14.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"结果已保存到: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("吞吐下降:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("与基线相比没有明显的吞吐下降")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import random
+import struct
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from YooAssetUnpacker import (
+    MANIFEST_FILE_SIGN,
+    BUILDIN_CATALOG_FILE_SIGN,
+    SUPPORTED_VERSIONS,
+    BUILDIN_CATALOG_VERSION,
+)
+
+
+_UINT8 = struct.Struct("<B")
+_UINT16 = struct.Struct("<H")
+_INT32 = struct.Struct("<i")
+_UINT32 = struct.Struct("<I")
+_INT64 = struct.Struct("<q")
+
+
+class BufferWriter:
+    """二进制数据写入器，格式与 YooAssetUnpacker.BufferReader 对应"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write_byte(self, value: int):
+        self.buffer += _UINT8.pack(value)
+
+    def write_bool(self, value: bool):
+        self.buffer += _UINT8.pack(1 if value else 0)
+
+    def write_int32(self, value: int):
+        self.buffer += _INT32.pack(value)
+
+    def write_uint32(self, value: int):
+        self.buffer += _UINT32.pack(value)
+
+    def write_int64(self, value: int):
+        self.buffer += _INT64.pack(value)
+
+    def write_utf8(self, value: str):
+        """UInt16 长度 + UTF-8 字节"""
+        data = value.encode("utf-8")
+        self.buffer += _UINT16.pack(len(data))
+        self.buffer += data
+
+    def write_utf8_array(self, values: List[str]):
+        self.buffer += _UINT16.pack(len(values))
+        for value in values:
+            self.write_utf8(value)
+
+    def write_int32_array(self, values: List[int]):
+        self.buffer += _UINT16.pack(len(values))
+        self.buffer += struct.pack(f"<{len(values)}i", *values)
+
+    def getvalue(self) -> bytes:
+        return bytes(self.buffer)
+
+
+def random_ids(rng: random.Random, count: int, fanout: int) -> List[int]:
+    """0 ~ fanout 个不重复的随机 id"""
+    if count <= 0 or fanout <= 0:
+        return []
+    return rng.sample(range(count), rng.randint(0, min(fanout, count)))
+
+
+def random_tags(rng: random.Random, tags: List[str], per_record: int) -> List[str]:
+    if not tags or per_record <= 0:
+        return []
+    return rng.sample(tags, rng.randint(0, min(per_record, len(tags))))
+
+
+def generate_manifest(
+    version: str,
+    asset_count: int = 1000,
+    bundle_count: int = 100,
+    tag_count: int = 8,
+    fanout: int = 4,
+    seed: int = 0,
+    addressable: bool = False,
+    replace_asset_path: bool = False,
+    package_name: str = "DefaultPackage",
+    package_version: Optional[str] = None,
+) -> bytes:
+    """生成指定版本的清单 .bytes 内容
+
+    Args:
+        version: SUPPORTED_VERSIONS 中的文件版本
+        asset_count: 资源数量
+        bundle_count: 资源包数量
+        tag_count: 标签池大小（每条记录随机带 0~2 个标签）
+        fanout: 每条记录最多的依赖数量
+        seed: 随机种子，相同参数生成相同内容
+        addressable: EnableAddressable
+        replace_asset_path: ReplaceAssetPathWithAddress（仅 2025.9.30，需要 addressable）
+    """
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"不支持的版本: {version}")
+    if replace_asset_path and not addressable:
+        raise ValueError("ReplaceAssetPathWithAddress 需要启用 Addressable")
+
+    rng = random.Random(seed)
+    tags = [f"tag{i}" for i in range(tag_count)]
+    package_version = package_version or f"{version}.{seed}"
+    numeric_crc = version in ["2025.8.28", "2025.9.30"]
+
+    writer = BufferWriter()
+
+    # 文件头
+    writer.write_uint32(MANIFEST_FILE_SIGN)
+    writer.write_utf8(version)
+    writer.write_bool(addressable)
+    if version in ["2025.8.28", "2025.9.30"]:
+        writer.write_bool(True)  # SupportExtensionless
+    writer.write_bool(not addressable)  # LocationToLower（Addressable 时必须为 false）
+    writer.write_bool(True)  # IncludeAssetGUID
+    if version == "2025.9.30":
+        writer.write_bool(replace_asset_path)
+    writer.write_int32(1)  # OutputNameStyle
+    if version != "1.5.2":
+        if version != "2.0.0":
+            writer.write_int32(2)  # BuildBundleType
+        writer.write_utf8("ScriptableBuildPipeline")
+    writer.write_utf8(package_name)
+    writer.write_utf8(package_version)
+    if version in ["2.3.1", "2025.8.28", "2025.9.30"]:
+        writer.write_utf8(f"generated by YooAssetManifestGen, seed {seed}")
+
+    # 资源列表
+    writer.write_int32(asset_count)
+    for i in range(asset_count):
+        folder = f"Assets/Art/{('Spine', 'Live2D', 'Texture')[i % 3]}/char{i % 97}"
+        writer.write_utf8(f"char{i % 97}_asset{i}")
+        writer.write_utf8("" if replace_asset_path else f"{folder}/asset{i}.prefab")
+        writer.write_utf8("%032x" % rng.getrandbits(128))
+        writer.write_utf8_array(random_tags(rng, tags, 2))
+        writer.write_int32(rng.randrange(bundle_count) if bundle_count else 0)
+        if version != "2.0.0":  # 2.0.0 的 PackageAsset 没有依赖数组
+            writer.write_int32_array(random_ids(rng, bundle_count, fanout))
+
+    # Bundle列表
+    writer.write_int32(bundle_count)
+    for i in range(bundle_count):
+        writer.write_utf8(f"assets_art_char{i % 97}_bundle{i}.bundle")
+        writer.write_uint32(rng.getrandbits(32))  # UnityCRC
+        writer.write_utf8("%032x" % rng.getrandbits(128))  # FileHash
+        if numeric_crc:
+            writer.write_uint32(rng.getrandbits(32))
+        else:
+            writer.write_utf8(str(rng.getrandbits(32)))
+        writer.write_int64(rng.randrange(1, 1 << 22))  # FileSize
+        if version == "1.5.2":
+            writer.write_bool(False)  # IsRawFile
+            writer.write_byte(0)  # LoadMethod
+        else:
+            writer.write_bool(rng.random() < 0.1)  # Encrypted
+        writer.write_utf8_array(random_tags(rng, tags, 2))
+        # 1.5.2 为 ReferenceIDs，2.0.0 为 DependIDs，2.3.1+ 为 DependBundleIDs
+        writer.write_int32_array(random_ids(rng, bundle_count, fanout))
+
+    return writer.getvalue()
+
+
+def generate_buildin_catalog(
+    file_count: int = 100,
+    seed: int = 0,
+    package_name: str = "DefaultPackage",
+    package_version: str = "1.0.0",
+) -> bytes:
+    """生成 BuildinCatalog .bytes 内容"""
+    rng = random.Random(seed)
+    writer = BufferWriter()
+    writer.write_uint32(BUILDIN_CATALOG_FILE_SIGN)
+    writer.write_utf8(BUILDIN_CATALOG_VERSION)
+    writer.write_utf8(package_name)
+    writer.write_utf8(package_version)
+    writer.write_int32(file_count)
+    for _ in range(file_count):
+        file_hash = "%032x" % rng.getrandbits(128)
+        writer.write_utf8(file_hash)  # BundleGUID
+        writer.write_utf8(f"{file_hash}.bundle")  # FileName
+    return writer.getvalue()
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="生成 YooAsset 测试清单与 BuildinCatalog")
+    parser.add_argument("output", help="输出目录")
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        choices=SUPPORTED_VERSIONS,
+        default=SUPPORTED_VERSIONS,
+        help="要生成的清单版本（默认全部）",
+    )
+    parser.add_argument("--assets", type=int, default=1000, help="资源数量（默认 1000）")
+    parser.add_argument("--bundles", type=int, default=100, help="资源包数量（默认 100）")
+    parser.add_argument("--tags", type=int, default=8, help="标签池大小（默认 8）")
+    parser.add_argument("--fanout", type=int, default=4, help="每条记录最多的依赖数量（默认 4）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（默认 0）")
+    parser.add_argument("--addressable", action="store_true", help="启用 Addressable")
+    parser.add_argument(
+        "--replace-asset-path",
+        action="store_true",
+        help="2025.9.30 清单启用 ReplaceAssetPathWithAddress（隐含 --addressable）",
+    )
+    return parser
+
+
+def main():
+
+    args = build_arg_parser().parse_args()
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for version in args.versions:
+        replace_asset_path = args.replace_asset_path and version == "2025.9.30"
+        data = generate_manifest(
+            version,
+            args.assets,
+            args.bundles,
+            args.tags,
+            args.fanout,
+            args.seed,
+            args.addressable or replace_asset_path,
+            replace_asset_path,
+        )
+        manifest_path = output_dir / f"DefaultPackage_{version}.bytes"
+        with open(manifest_path, "wb") as f:
+            f.write(data)
+        print(f"已生成: {manifest_path.name} ({len(data) / 1024 / 1024:.2f} MB)")
+
+    catalog_path = output_dir / "BuildinCatalog.bytes"
+    with open(catalog_path, "wb") as f:
+        f.write(generate_buildin_catalog(args.bundles, args.seed))
+    print(f"已生成: {catalog_path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
 import io
+import mmap
 import os
 import sys
 import shutil
 import json
-from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+import argparse
+import fnmatch
+import re
+import sqlite3
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
+from itertools import repeat
+from array import array
+from pathlib import Path, PurePosixPath
+from typing import List, Optional, Tuple, Dict, Any, Set, Callable
 import struct
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 
 
 MANIFEST_FILE_SIGN = 0x594F4F  # YOO
@@ -15,12 +28,38 @@ SUPPORTED_VERSIONS = ["1.5.2", "2.0.0", "2.3.1", "2025.8.28", "2025.9.30"]
 BUILDIN_CATALOG_VERSION = "1.0.0"
 
 
+_UINT8 = struct.Struct("<B")
+_INT16 = struct.Struct("<h")
+_UINT16 = struct.Struct("<H")
+_INT32 = struct.Struct("<i")
+_UINT32 = struct.Struct("<I")
+_INT64 = struct.Struct("<q")
+
+
 class BufferReader:
-    """二进制数据读取器"""
+    """二进制数据读取器（基于 memoryview，可直接读取 mmap）"""
 
-    def __init__(self, data: bytes):
+    def __init__(self, data):
         self.buffer = data
+        self.view = memoryview(data) if data is not None else None
         self.index = 0
+        self._int32_arrays: Dict[int, struct.Struct] = {}
+
+    @classmethod
+    def from_file(cls, path: Path) -> "BufferReader":
+        """以只读方式内存映射文件，用完需调用 close()"""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"")
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        """释放 memoryview 以及 mmap"""
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
 
     @property
     def is_valid(self) -> bool:
@@ -39,65 +78,100 @@ class BufferReader:
                 f"缓冲区溢出: 尝试读取 {count} 字节，索引 {self.index}，缓冲区大小: {len(self.buffer)}"
             )
 
+    def _unpack(self, fmt: struct.Struct) -> int:
+        """在当前位置直接解析一个数值"""
+        try:
+            value = fmt.unpack_from(self.view, self.index)[0]
+        except struct.error:
+            self._check_reader_index(fmt.size)
+            raise
+        self.index += fmt.size
+        return value
+
     def read_bytes(self, count: int) -> bytes:
         """读取指定数量的字节"""
         self._check_reader_index(count)
-        data = self.buffer[self.index : self.index + count]
+        data = self.view[self.index : self.index + count].tobytes()
         self.index += count
         return data
 
     def read_byte(self) -> int:
         """读取单个字节"""
-        return struct.unpack("<B", self.read_bytes(1))[0]
+        return self._unpack(_UINT8)
 
     def read_bool(self) -> bool:
         """读取布尔值"""
-        return self.read_byte() != 0
+        return self._unpack(_UINT8) != 0
 
     def read_int16(self) -> int:
         """读取16位整数（小端序）"""
-        return struct.unpack("<h", self.read_bytes(2))[0]
+        return self._unpack(_INT16)
 
     def read_uint16(self) -> int:
         """读取16位无符号整数（小端序）"""
-        return struct.unpack("<H", self.read_bytes(2))[0]
+        return self._unpack(_UINT16)
 
     def read_int32(self) -> int:
         """读取32位整数（小端序）"""
-        return struct.unpack("<i", self.read_bytes(4))[0]
+        return self._unpack(_INT32)
 
     def read_uint32(self) -> int:
         """读取32位无符号整数（小端序）"""
-        return struct.unpack("<I", self.read_bytes(4))[0]
+        return self._unpack(_UINT32)
 
     def read_int64(self) -> int:
         """读取64位整数（小端序）"""
-        return struct.unpack("<q", self.read_bytes(8))[0]
+        return self._unpack(_INT64)
 
     def skip_utf8(self):
         """跳过UTF-8字符串而不解析"""
-        length = self.read_uint16()
+        length = self._unpack(_UINT16)
         if length > 0:
             self._check_reader_index(length)
             self.index += length
 
     def read_utf8(self) -> str:
-        """读取UTF-8字符串"""
-        length = self.read_uint16()
+        """读取UTF-8字符串（直接从 memoryview 解码）"""
+        length = self._unpack(_UINT16)
         if length == 0:
             return ""
-        string_bytes = self.read_bytes(length)
-        return string_bytes.decode("utf-8")
+        self._check_reader_index(length)
+        start = self.index
+        self.index += length
+        return str(self.view[start : self.index], "utf-8")
 
     def read_utf8_array(self) -> List[str]:
         """读取UTF-8字符串数组"""
-        count = self.read_uint16()
+        count = self._unpack(_UINT16)
         return [self.read_utf8() for _ in range(count)]
 
     def read_int32_array(self) -> List[int]:
-        """读取32位整数数组"""
-        count = self.read_uint16()
-        return [self.read_int32() for _ in range(count)]
+        """读取32位整数数组（一次解析整个数组）"""
+        count = self._unpack(_UINT16)
+        if count == 0:
+            return []
+        fmt = self._int32_arrays.get(count)
+        if fmt is None:
+            fmt = self._int32_arrays[count] = struct.Struct(f"<{count}i")
+        self._check_reader_index(fmt.size)
+        values = list(fmt.unpack_from(self.view, self.index))
+        self.index += fmt.size
+        return values
+
+    def read_int32_array_into(self, target: array):
+        """读取32位整数数组并直接追加到 array('i') 中"""
+        count = self._unpack(_UINT16)
+        if count == 0:
+            return
+        size = count * 4
+        self._check_reader_index(size)
+        start = len(target)
+        target.frombytes(self.view[self.index : self.index + size])
+        if sys.byteorder == "big":
+            tail = target[start:]
+            tail.byteswap()
+            target[start:] = tail
+        self.index += size
 
 
 @dataclass
@@ -201,21 +275,236 @@ class BuildinCatalog:
             self.wrappers = []
 
 
+class RaggedArray:
+    """变长列：所有行的元素连续存放在 values 中，第 i 行为 values[offsets[i]:offsets[i+1]]"""
+
+    __slots__ = ("offsets", "values")
+
+    def __init__(self, values):
+        self.offsets = array("q", [0])
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> list:
+        items = self.values[self.offsets[index] : self.offsets[index + 1]]
+        return items.tolist() if isinstance(items, array) else items
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, items):
+        """追加一行"""
+        self.values.extend(items)
+        self.end_row()
+
+    def end_row(self):
+        """以 values 当前长度结束一行（配合直接写入 values 使用）"""
+        self.offsets.append(len(self.values))
+
+
+class ColumnRow:
+    """列式表中一行的轻量视图，属性按需从列中读取"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        return self._table.value(name, self._index)
+
+    def __repr__(self) -> str:
+        return f"{type(self._table).__name__}[{self._index}]"
+
+    def to_dataclass(self):
+        """转换为对应的 dataclass 对象"""
+        return self._table.to_dataclass(self._index)
+
+
+class ColumnTable:
+    """列式表基类"""
+
+    row_type = None
+    # 变长整数列对应的字段名，例如 depend_ids / depend_bundle_ids
+    ids_field: Optional[str] = None
+    # 按下标直接返回的列与变长列
+    direct_columns: Tuple[str, ...] = ()
+    ragged_columns: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> ColumnRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ColumnRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ColumnRow(self, index)
+
+    def value(self, name: str, index: int):
+        raise NotImplementedError
+
+    def column(self, name: str) -> list:
+        """整列读取，直接存储的列不逐行创建视图"""
+        if name in self.direct_columns:
+            return getattr(self, name)
+        if name in self.ragged_columns:
+            return list(getattr(self, name))
+        return [self.value(name, index) for index in range(len(self))]
+
+    def to_dataclass(self, index: int):
+        return self.row_type(
+            **{f.name: self.value(f.name, index) for f in fields(self.row_type)}
+        )
+
+
+class ColumnarAssets(ColumnTable):
+    """列式存储的 PackageAsset 表"""
+
+    row_type = PackageAsset
+    direct_columns = ("address", "asset_path", "asset_guid", "bundle_id")
+    ragged_columns = ("asset_tags",)
+
+    def __init__(self, ids_field: Optional[str]):
+        self.ids_field = ids_field
+        self.address: List[str] = []
+        self.asset_path: List[str] = []
+        self.asset_guid: List[str] = []
+        self.asset_tags = RaggedArray([])
+        self.bundle_id = array("i")
+        self.ids = RaggedArray(array("i"))
+
+    def __len__(self) -> int:
+        return len(self.bundle_id)
+
+    def value(self, name: str, index: int):
+        if name in self.direct_columns:
+            return getattr(self, name)[index]
+        if name == "asset_tags":
+            return self.asset_tags[index]
+        if name in ("depend_ids", "depend_bundle_ids"):
+            return self.ids[index] if name == self.ids_field else []
+        raise AttributeError(name)
+
+
+class ColumnarBundles(ColumnTable):
+    """列式存储的 PackageBundle 表"""
+
+    row_type = PackageBundle
+    direct_columns = ("bundle_name", "unity_crc", "file_hash", "file_size")
+    ragged_columns = ("tags",)
+
+    def __init__(self, ids_field: str, numeric_crc: bool):
+        self.ids_field = ids_field
+        # 2025.8.28+ 的 FileCRC 为 UInt32，按数值存储，读取时再转为字符串
+        self.numeric_crc = numeric_crc
+        self.bundle_name: List[str] = []
+        self.unity_crc = array("I")
+        self.file_hash: List[str] = []
+        self.file_crc = array("I") if numeric_crc else []
+        self.file_size = array("q")
+        self.is_raw_file = array("b")
+        self.load_method = array("B")
+        self.encrypted = array("b")
+        self.tags = RaggedArray([])
+        self.ids = RaggedArray(array("i"))
+
+    def __len__(self) -> int:
+        return len(self.file_size)
+
+    def value(self, name: str, index: int):
+        if name in self.direct_columns:
+            return getattr(self, name)[index]
+        if name == "file_crc":
+            crc = self.file_crc[index]
+            return str(crc) if self.numeric_crc else crc
+        if name in ("is_raw_file", "encrypted"):
+            column = getattr(self, name)
+            return bool(column[index]) if column else False
+        if name == "load_method":
+            return self.load_method[index] if self.load_method else 0
+        if name == "tags":
+            return self.tags[index]
+        if name in ("reference_ids", "depend_ids", "depend_bundle_ids"):
+            return self.ids[index] if name == self.ids_field else []
+        raise AttributeError(name)
+
+
+class ColumnarManifest:
+    """列式存储的资源包清单（struct-of-arrays），用于降低大型清单的内存占用
+
+    表头字段与 PackageManifest 相同；asset_list / bundle_list 为按需创建行视图的列式表，
+    通过 to_manifest() 可转换回 dataclass 形式的 PackageManifest。
+    """
+
+    def __init__(
+        self, header: PackageManifest, assets: ColumnarAssets, bundles: ColumnarBundles
+    ):
+        self.header = header
+        self.asset_list = assets
+        self.bundle_list = bundles
+
+    def __getattr__(self, name: str):
+        return getattr(self.header, name)
+
+    def to_manifest(self) -> PackageManifest:
+        """转换为 PackageManifest（会为每一行创建 dataclass 对象）"""
+        manifest = PackageManifest(
+            **{
+                f.name: getattr(self.header, f.name)
+                for f in fields(PackageManifest)
+                if f.name not in ("asset_list", "bundle_list")
+            }
+        )
+        manifest.asset_list = [
+            self.asset_list.to_dataclass(i) for i in range(len(self.asset_list))
+        ]
+        manifest.bundle_list = [
+            self.bundle_list.to_dataclass(i) for i in range(len(self.bundle_list))
+        ]
+        return manifest
+
+
 class YooAssetDeserializer:
     """YooAsset通用反序列化器"""
 
-    def __init__(self, binary_data: bytes):
-        self.buffer = BufferReader(binary_data)
+    def __init__(self, binary_data):
+        self.buffer = (
+            binary_data
+            if isinstance(binary_data, BufferReader)
+            else BufferReader(binary_data)
+        )
         self.manifest: Optional[PackageManifest] = None
         self.version: Optional[str] = None
+        self.bundles_only = False
+
+    def deserialize(
+        self, columnar: bool = False, bundles_only: bool = False
+    ) -> PackageManifest:
+        """反序列化清单文件
 
-    def deserialize(self) -> PackageManifest:
-        """反序列化清单文件"""
+        Args:
+            columnar: 为 True 时返回列式存储的 ColumnarManifest
+            bundles_only: 为 True 时跳过资源表（asset_list 为空），只解析Bundle列表
+        """
         if not self.buffer.is_valid:
             raise ValueError("无效的缓冲区数据")
 
+        self.bundles_only = bundles_only
+
         self._deserialize_file_header()
 
+        if columnar:
+            return self._deserialize_columnar()
+
         if self.version == "1.5.2":
             self._deserialize_v152()
         elif self.version == "2.0.0":
@@ -280,9 +569,40 @@ class YooAssetDeserializer:
         ):
             raise ValueError("ReplaceAssetPathWithAddress 需要启用 Addressable")
 
+    def _read_asset_count(self) -> int:
+        """读取资源数量；bundles_only 模式下直接跳过整个资源表并返回 0"""
+        asset_count = self.buffer.read_int32()
+        if not self.bundles_only:
+            return asset_count
+
+        # 只按长度前缀移动偏移，不创建任何对象
+        buffer = self.buffer
+        view = buffer.view
+        index = buffer.index
+        read_uint16 = _UINT16.unpack_from
+        # 2.0.0版本的PackageAsset没有依赖数组
+        has_depend_ids = self.version != "2.0.0"
+        try:
+            for _ in range(asset_count):
+                for _ in range(3):  # Address, AssetPath, AssetGUID
+                    index += 2 + read_uint16(view, index)[0]
+                tag_count = read_uint16(view, index)[0]  # AssetTags
+                index += 2
+                for _ in range(tag_count):
+                    index += 2 + read_uint16(view, index)[0]
+                index += 4  # BundleID
+                if has_depend_ids:
+                    index += 2 + 4 * read_uint16(view, index)[0]
+        except struct.error:
+            index = buffer.capacity + 1
+        if index > buffer.capacity:
+            raise IndexError(f"缓冲区溢出: 跳过资源表时越界，缓冲区大小: {buffer.capacity}")
+        buffer.index = index
+        return 0
+
     def _deserialize_v152(self):
         """反序列化1.5.2版本的资源列表和Bundle列表"""
-        asset_count = self.buffer.read_int32()
+        asset_count = self._read_asset_count()
         self.manifest.asset_list = []
 
         for _ in range(asset_count):
@@ -313,7 +633,7 @@ class YooAssetDeserializer:
 
     def _deserialize_v200(self):
         """反序列化2.0.0版本的资源列表和Bundle列表"""
-        asset_count = self.buffer.read_int32()
+        asset_count = self._read_asset_count()
         self.manifest.asset_list = []
 
         for _ in range(asset_count):
@@ -343,7 +663,7 @@ class YooAssetDeserializer:
 
     def _deserialize_v2312(self):
         """反序列化2.3.12版本的资源列表和Bundle列表"""
-        asset_count = self.buffer.read_int32()
+        asset_count = self._read_asset_count()
         self.manifest.asset_list = []
 
         for _ in range(asset_count):
@@ -378,7 +698,7 @@ class YooAssetDeserializer:
 
     def _deserialize_v2317(self):
         """反序列化2.3.17版本(2025.8.28/2025.9.30)的资源列表和Bundle列表"""
-        asset_count = self.buffer.read_int32()
+        asset_count = self._read_asset_count()
         self.manifest.asset_list = []
 
         # 判断是否需要替换AssetPath
@@ -423,11 +743,74 @@ class YooAssetDeserializer:
             self.manifest.bundle_list.append(bundle)
 
 
+    def _deserialize_columnar(self) -> ColumnarManifest:
+        """按列反序列化资源列表和Bundle列表（支持所有版本）"""
+        buffer = self.buffer
+        version = self.version
+        intern = sys.intern
+
+        if version == "1.5.2":
+            asset_ids_field, bundle_ids_field = "depend_ids", "reference_ids"
+        elif version == "2.0.0":
+            asset_ids_field, bundle_ids_field = None, "depend_ids"
+        else:
+            asset_ids_field, bundle_ids_field = "depend_bundle_ids", "depend_bundle_ids"
+
+        replace_asset_path = (
+            self.manifest.enable_addressable
+            and self.manifest.replace_asset_path_with_address
+        )
+
+        assets = ColumnarAssets(asset_ids_field)
+        asset_count = self._read_asset_count()
+        for _ in range(asset_count):
+            address = buffer.read_utf8()
+            assets.address.append(address)
+            if replace_asset_path:
+                assets.asset_path.append(address)
+                buffer.skip_utf8()
+            else:
+                assets.asset_path.append(buffer.read_utf8())
+            assets.asset_guid.append(intern(buffer.read_utf8()))
+            assets.asset_tags.append([intern(t) for t in buffer.read_utf8_array()])
+            assets.bundle_id.append(buffer.read_int32())
+            if asset_ids_field:
+                buffer.read_int32_array_into(assets.ids.values)
+            assets.ids.end_row()
+
+        numeric_crc = version in ["2025.8.28", "2025.9.30"]
+        bundles = ColumnarBundles(bundle_ids_field, numeric_crc)
+        bundle_count = buffer.read_int32()
+        for _ in range(bundle_count):
+            bundles.bundle_name.append(buffer.read_utf8())
+            bundles.unity_crc.append(buffer.read_uint32())
+            bundles.file_hash.append(buffer.read_utf8())
+            if numeric_crc:
+                bundles.file_crc.append(buffer.read_uint32())
+            else:
+                bundles.file_crc.append(buffer.read_utf8())
+            bundles.file_size.append(buffer.read_int64())
+            if version == "1.5.2":
+                bundles.is_raw_file.append(buffer.read_bool())
+                bundles.load_method.append(buffer.read_byte())
+            else:
+                bundles.encrypted.append(buffer.read_bool())
+            bundles.tags.append([intern(t) for t in buffer.read_utf8_array()])
+            buffer.read_int32_array_into(bundles.ids.values)
+            bundles.ids.end_row()
+
+        return ColumnarManifest(self.manifest, assets, bundles)
+
+
 class BuildinCatalogDeserializer:
     """BuildinCatalog 反序列化器"""
 
-    def __init__(self, binary_data: bytes):
-        self.buffer = BufferReader(binary_data)
+    def __init__(self, binary_data):
+        self.buffer = (
+            binary_data
+            if isinstance(binary_data, BufferReader)
+            else BufferReader(binary_data)
+        )
         self.catalog: Optional[BuildinCatalog] = None
 
     def deserialize(self) -> BuildinCatalog:
@@ -462,6 +845,34 @@ class BuildinCatalogDeserializer:
         return self.catalog
 
 
+@dataclass
+class ExtractOptions:
+    """提取选项"""
+
+    columnar: bool = False  # 使用列式存储的清单以降低内存占用
+    bundles_only: bool = False  # 只解析Bundle列表，跳过资源表
+    json_format: str = "json"  # 清单导出格式：json / ndjson
+    json_compact: bool = False  # 导出 JSON 时不缩进
+    output_mode: str = "copy"  # 输出方式：copy / hardlink / reflink / move
+    workers: int = 8  # 输出资源包的线程数
+    only_changed: Optional[str] = None  # 旧版本清单文件/目录，只提取新增和变更的资源包
+    force: bool = False  # 忽略并重建输出目录中的提取状态
+    verify: Optional[str] = None  # 校验输出的资源包：size / crc
+    assets: Optional[List[str]] = None  # 按资源路径（glob）筛选
+    addresses: Optional[List[str]] = None  # 按可寻址地址（glob）筛选
+    tags: Optional[List[str]] = None  # 按资源/资源包标签（glob）筛选
+    paths: Optional[List[str]] = None  # 按资源路径前缀（glob）筛选
+    sqlite: Optional[str] = None  # 把清单导出到 SQLite 数据库
+
+    def selects_assets(self) -> bool:
+        """是否按资源或资源 asset_tags 筛选（需要解析资源表）"""
+        return bool(self.assets or self.addresses or self.paths or self.tags)
+
+    def selects_bundles(self) -> bool:
+        """是否按资源或标签筛选资源包"""
+        return self.selects_assets() or bool(self.tags)
+
+
 def find_bytes_files(root_path: Path) -> Tuple[str, List[Path]]:
 
     manifest_files_dirs = list(root_path.rglob("ManifestFiles"))
@@ -508,11 +919,65 @@ def dataclass_to_dict(obj: Any) -> Any:
         return obj
 
 
-def save_manifest_to_json(manifest: PackageManifest, output_path: Path):
-    """将 PackageManifest 保存为 JSON 文件"""
-    data = dataclass_to_dict(manifest)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+def record_to_dict(record: Any) -> Dict[str, Any]:
+    """将单条 PackageAsset / PackageBundle（或列式行视图）浅转换为字典"""
+    row_type = record._table.row_type if isinstance(record, ColumnRow) else record
+    return {f.name: getattr(record, f.name) for f in fields(row_type)}
+
+
+def save_manifest_to_json(
+    manifest: PackageManifest,
+    output_path: Path,
+    json_format: str = "json",
+    compact: bool = False,
+):
+    """将 PackageManifest 逐条流式写入 JSON 文件，不在内存中构建整个字典
+
+    Args:
+        json_format: "json" 输出与 json.dump 相同结构的对象；"ndjson" 每行一条记录
+            （第一行为表头，之后每行带 record 字段区分 asset / bundle）
+        compact: 不缩进，使用紧凑分隔符
+    """
+    header = {
+        f.name: getattr(manifest, f.name)
+        for f in fields(PackageManifest)
+        if f.name not in ("asset_list", "bundle_list")
+    }
+    tables = [("asset_list", manifest.asset_list), ("bundle_list", manifest.bundle_list)]
+
+    with open(output_path, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+        if json_format == "ndjson":
+            encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+            f.write(encoder.encode(dict(header, record="header")) + "\n")
+            for name, table in tables:
+                record_name = name[: -len("_list")]
+                for record in table:
+                    item = record_to_dict(record)
+                    item["record"] = record_name
+                    f.write(encoder.encode(item) + "\n")
+        else:
+            if compact:
+                encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+                newline, indent, item_indent = "", "", ""
+            else:
+                encoder = json.JSONEncoder(ensure_ascii=False, indent=4)
+                newline, indent, item_indent = "\n", " " * 4, " " * 8
+            key_sep = ":" if compact else ": "
+            f.write("{")
+            for name, value in header.items():
+                f.write(f"{newline}{indent}{encoder.encode(name)}{key_sep}{encoder.encode(value)},")
+            for i, (name, table) in enumerate(tables):
+                f.write(f"{newline}{indent}{encoder.encode(name)}{key_sep}[")
+                empty = True
+                for record in table:
+                    item = encoder.encode(record_to_dict(record))
+                    if newline:
+                        item = item.replace("\n", "\n" + item_indent)
+                    f.write(("" if empty else ",") + f"{newline}{item_indent}{item}")
+                    empty = False
+                f.write("]" if empty else f"{newline}{indent}]")
+                f.write("," if i < len(tables) - 1 else "")
+            f.write(f"{newline}}}")
     print(f"已导出 JSON: {output_path.name}")
 
 
@@ -534,32 +999,255 @@ def save_buildin_catalogs_to_json(
     )
 
 
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    id INTEGER PRIMARY KEY,
+    package_name TEXT NOT NULL,
+    package_version TEXT NOT NULL,
+    file_version TEXT,
+    build_pipeline TEXT,
+    package_note TEXT,
+    enable_addressable INTEGER,
+    source TEXT,
+    UNIQUE (package_name, package_version)
+);
+CREATE TABLE IF NOT EXISTS bundles (
+    package_id INTEGER NOT NULL,
+    bundle_id INTEGER NOT NULL,
+    bundle_name TEXT NOT NULL,
+    file_hash TEXT,
+    file_crc TEXT,
+    file_size INTEGER,
+    unity_crc INTEGER,
+    encrypted INTEGER,
+    PRIMARY KEY (package_id, bundle_id)
+);
+CREATE TABLE IF NOT EXISTS assets (
+    package_id INTEGER NOT NULL,
+    asset_id INTEGER NOT NULL,
+    address TEXT,
+    asset_path TEXT,
+    asset_guid TEXT,
+    bundle_id INTEGER,
+    PRIMARY KEY (package_id, asset_id)
+);
+CREATE TABLE IF NOT EXISTS tags (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS bundle_tags (package_id INTEGER, bundle_id INTEGER, tag_id INTEGER);
+CREATE TABLE IF NOT EXISTS asset_tags (package_id INTEGER, asset_id INTEGER, tag_id INTEGER);
+CREATE TABLE IF NOT EXISTS bundle_depends (package_id INTEGER, bundle_id INTEGER, depend_bundle_id INTEGER);
+CREATE TABLE IF NOT EXISTS asset_depends (package_id INTEGER, asset_id INTEGER, depend_bundle_id INTEGER);
+CREATE INDEX IF NOT EXISTS idx_bundles_name ON bundles (bundle_name);
+CREATE INDEX IF NOT EXISTS idx_bundles_hash ON bundles (file_hash);
+CREATE INDEX IF NOT EXISTS idx_assets_path ON assets (asset_path);
+CREATE INDEX IF NOT EXISTS idx_assets_address ON assets (address);
+CREATE INDEX IF NOT EXISTS idx_bundle_tags_tag ON bundle_tags (tag_id);
+CREATE INDEX IF NOT EXISTS idx_asset_tags_tag ON asset_tags (tag_id);
+CREATE INDEX IF NOT EXISTS idx_bundle_depends ON bundle_depends (package_id, bundle_id);
+CREATE INDEX IF NOT EXISTS idx_asset_depends ON asset_depends (package_id, asset_id);
+"""
+# 随包一起删除/重建的表
+SQLITE_PACKAGE_TABLES = [
+    "bundles",
+    "assets",
+    "bundle_tags",
+    "asset_tags",
+    "bundle_depends",
+    "asset_depends",
+]
+
+
+class ManifestDatabase:
+    """把清单导出到规范化并建立索引的 SQLite 数据库，之后的查询不需要再反序列化
+
+    每个清单在一个事务中批量写入；同一包名和版本重复导入时替换旧数据。
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA cache_size = -65536")
+        self.conn.executescript(SQLITE_SCHEMA)
+        self.tag_ids = {
+            name: tag_id
+            for tag_id, name in self.conn.execute("SELECT id, name FROM tags")
+        }
+
+    def _tag_rows(self, package_id: int, tag_lists) -> List[Tuple[int, int, int]]:
+        rows = []
+        for row_id, tags in enumerate(tag_lists):
+            for tag in tags:
+                tag_id = self.tag_ids.get(tag)
+                if tag_id is None:
+                    tag_id = self.conn.execute(
+                        "INSERT INTO tags (name) VALUES (?)", (tag,)
+                    ).lastrowid
+                    self.tag_ids[tag] = tag_id
+                rows.append((package_id, row_id, tag_id))
+        return rows
+
+    @staticmethod
+    def _edge_rows(package_id: int, table: Any, names: Tuple[str, str]):
+        """依赖边：每行取 names 中第一个非空的 id 列"""
+        if isinstance(table, ColumnTable):
+            # 列式表只有 ids_field 一列依赖，按 offsets 直接切分
+            if table.ids_field not in names:
+                return
+            offsets, values = table.ids.offsets, table.ids.values
+            for row_id in range(len(table)):
+                for index in range(offsets[row_id], offsets[row_id + 1]):
+                    yield package_id, row_id, values[index]
+            return
+
+        for row_id, (first, second) in enumerate(
+            zip(table_column(table, names[0]), table_column(table, names[1]))
+        ):
+            for depend_id in first or second:
+                yield package_id, row_id, depend_id
+
+    def add_manifest(self, manifest: Any, source: str = ""):
+        assets = manifest.asset_list
+        bundles = manifest.bundle_list
+        tag_ids_before = dict(self.tag_ids)
+        try:
+            with self.conn:
+                row = self.conn.execute(
+                    "SELECT id FROM packages WHERE package_name = ? AND package_version = ?",
+                    (manifest.package_name, manifest.package_version),
+                ).fetchone()
+                if row is not None:
+                    for table in SQLITE_PACKAGE_TABLES:
+                        self.conn.execute(
+                            f"DELETE FROM {table} WHERE package_id = ?", (row[0],)
+                        )
+                    self.conn.execute("DELETE FROM packages WHERE id = ?", (row[0],))
+
+                package_id = self.conn.execute(
+                    "INSERT INTO packages (package_name, package_version, file_version, "
+                    "build_pipeline, package_note, enable_addressable, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        manifest.package_name,
+                        manifest.package_version,
+                        manifest.file_version,
+                        manifest.build_pipeline,
+                        manifest.package_note,
+                        int(manifest.enable_addressable),
+                        source,
+                    ),
+                ).lastrowid
+
+                self.conn.executemany(
+                    "INSERT INTO bundles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    zip(
+                        repeat(package_id),
+                        range(len(bundles)),
+                        table_column(bundles, "bundle_name"),
+                        table_column(bundles, "file_hash"),
+                        table_column(bundles, "file_crc"),
+                        table_column(bundles, "file_size"),
+                        table_column(bundles, "unity_crc"),
+                        table_column(bundles, "encrypted"),
+                    ),
+                )
+                self.conn.executemany(
+                    "INSERT INTO assets VALUES (?, ?, ?, ?, ?, ?)",
+                    zip(
+                        repeat(package_id),
+                        range(len(assets)),
+                        table_column(assets, "address"),
+                        table_column(assets, "asset_path"),
+                        table_column(assets, "asset_guid"),
+                        table_column(assets, "bundle_id"),
+                    ),
+                )
+                self.conn.executemany(
+                    "INSERT INTO bundle_tags VALUES (?, ?, ?)",
+                    self._tag_rows(package_id, table_column(bundles, "tags")),
+                )
+                self.conn.executemany(
+                    "INSERT INTO asset_tags VALUES (?, ?, ?)",
+                    self._tag_rows(package_id, table_column(assets, "asset_tags")),
+                )
+                self.conn.executemany(
+                    "INSERT INTO bundle_depends VALUES (?, ?, ?)",
+                    self._edge_rows(
+                        package_id, bundles, ("depend_bundle_ids", "depend_ids")
+                    ),
+                )
+                self.conn.executemany(
+                    "INSERT INTO asset_depends VALUES (?, ?, ?)",
+                    self._edge_rows(
+                        package_id, assets, ("depend_bundle_ids", "depend_ids")
+                    ),
+                )
+        except Exception:
+            # 事务已回滚，新增标签的 id 不再有效
+            self.tag_ids = tag_ids_before
+            raise
+
+        print(
+            f"已写入 SQLite: {self.path.name} ({manifest.package_name} {manifest.package_version}, "
+            f"资源 {len(assets)} 个，资源包 {len(bundles)} 个)"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "ManifestDatabase":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_manifest_database(path: Optional[str]):
+    """--sqlite 时打开数据库，否则返回值为 None 的上下文"""
+    return ManifestDatabase(Path(path)) if path else nullcontext()
+
+
 def process_manifest_file(
     bytes_file: Path,
     output_dir: Optional[Path] = None,
     buildin_catalogs: Optional[Dict[str, BuildinCatalog]] = None,
+    columnar: bool = False,
+    bundles_only: bool = False,
+    json_format: str = "json",
+    json_compact: bool = False,
+    data: Optional[bytes] = None,
+    database: Optional[ManifestDatabase] = None,
 ) -> Optional[PackageManifest]:
     """读取并反序列化单个清单文件
 
     Args:
-        bytes_file: 清单文件路径
+        bytes_file: 清单文件路径（传入 data 时仅用于显示和命名）
         output_dir: JSON 输出目录（为 None 时不导出 JSON）
         buildin_catalogs: BuildinCatalog 收集字典（用于合并导出）
+        columnar: 返回列式存储的 ColumnarManifest
+        bundles_only: 跳过资源表，只解析Bundle列表
+        json_format: 清单导出格式（json / ndjson）
+        json_compact: 导出 JSON 时不缩进
+        data: 已在内存中的清单内容（例如从 APK 中读取），为 None 时从 bytes_file 读取
+        database: 同时把清单写入的 SQLite 数据库
 
     Returns:
         PackageManifest 对象，如果是 BuildinCatalog 则返回 None
     """
+    reader = None
     try:
-        binary_data = bytes_file.read_bytes()
+        reader = (
+            BufferReader.from_file(bytes_file) if data is None else BufferReader(data)
+        )
 
-        if len(binary_data) < 4:
+        if reader.capacity < 4:
             print(f"跳过 {bytes_file.name}: 文件太小")
             return None
 
-        file_sign = struct.unpack("<I", binary_data[:4])[0]
+        file_sign = _UINT32.unpack_from(reader.view, 0)[0]
 
         if file_sign == BUILDIN_CATALOG_FILE_SIGN:
-            deserializer = BuildinCatalogDeserializer(binary_data)
+            deserializer = BuildinCatalogDeserializer(reader)
             catalog = deserializer.deserialize()
             print(
                 f"{bytes_file.name} (BuildinCatalog), 版本: {catalog.file_version}, 包名: {catalog.package_name}, 文件数: {len(catalog.wrappers)}"
@@ -571,15 +1259,19 @@ def process_manifest_file(
             return None
 
         elif file_sign == MANIFEST_FILE_SIGN:
-            deserializer = YooAssetDeserializer(binary_data)
-            manifest = deserializer.deserialize()
+            deserializer = YooAssetDeserializer(reader)
+            manifest = deserializer.deserialize(columnar, bundles_only)
             print(
                 f"{bytes_file.name}, 版本: {manifest.file_version}, 包名: {manifest.package_name}, Bundles: {len(manifest.bundle_list)}"
             )
 
             if output_dir:
-                json_path = output_dir / f"{bytes_file.stem}.json"
-                save_manifest_to_json(manifest, json_path)
+                suffix = ".ndjson" if json_format == "ndjson" else ".json"
+                json_path = output_dir / f"{bytes_file.stem}{suffix}"
+                save_manifest_to_json(manifest, json_path, json_format, json_compact)
+
+            if database is not None:
+                database.add_manifest(manifest, str(bytes_file))
 
             return manifest
 
@@ -587,58 +1279,979 @@ def process_manifest_file(
             print(f"跳过 {bytes_file.name}: 未知的文件签名 0x{file_sign:X}")
             return None
 
+    except sqlite3.Error:
+        # 数据库错误（锁定、磁盘已满等）不能当作清单解析失败而跳过
+        raise
+
     except Exception as e:
         print(f"处理 {bytes_file.name} 时出错: {e}")
         return None
 
+    finally:
+        if reader is not None:
+            reader.close()
+
+
+@dataclass
+class BundleDiff:
+    """两个版本之间资源包的差异（按 bundle_name 对比）"""
+
+    added: List[str] = None
+    changed: List[str] = None
+    removed: List[str] = None
+
+    def __post_init__(self):
+        if self.added is None:
+            self.added = []
+        if self.changed is None:
+            self.changed = []
+        if self.removed is None:
+            self.removed = []
+
+
+def load_bundle_index(path: Path) -> Dict[str, Any]:
+    """读取单个清单文件或目录下的所有清单，返回 bundle_name -> 资源包
+
+    只解析Bundle列表；传入 CacheBundleFiles 目录时使用同级的 ManifestFiles。
+    同名资源包以文件名排序靠后的清单为准。
+    """
+    if path.is_file():
+        bytes_files = [path]
+    else:
+        _, bytes_files = find_bytes_files(path)
+        if not bytes_files and (path.parent / "ManifestFiles").is_dir():
+            bytes_files = list((path.parent / "ManifestFiles").glob("*.bytes"))
+
+    index = {}
+    for bytes_file in sorted(bytes_files):
+        manifest = process_manifest_file(bytes_file, bundles_only=True)
+        if manifest:
+            for bundle in manifest.bundle_list:
+                index[bundle.bundle_name] = bundle
+    return index
+
+
+def bundle_changed(old: Any, new: Any) -> bool:
+    return old.file_hash != new.file_hash or old.file_crc != new.file_crc
+
+
+def diff_bundle_indexes(old: Dict[str, Any], new: Dict[str, Any]) -> BundleDiff:
+    diff = BundleDiff()
+    for name, bundle in new.items():
+        old_bundle = old.get(name)
+        if old_bundle is None:
+            diff.added.append(name)
+        elif bundle_changed(old_bundle, bundle):
+            diff.changed.append(name)
+    diff.removed = [name for name in old if name not in new]
+    return diff
+
+
+def compile_globs(patterns: List[str]) -> Callable[[str], bool]:
+    """把一组 glob 模式编译为匹配函数，不含通配符的模式按集合直接查找"""
+    exact = {pattern for pattern in patterns if not re.search(r"[*?\[]", pattern)}
+    globs = [pattern for pattern in patterns if pattern not in exact]
+    regex = (
+        re.compile("|".join(fnmatch.translate(pattern) for pattern in globs))
+        if globs
+        else None
+    )
+
+    def match(value: str) -> bool:
+        return value in exact or (regex is not None and regex.match(value) is not None)
+
+    return match
+
+
+def table_column(table: Any, name: str) -> list:
+    """读取 asset_list / bundle_list 的一整列，列式表直接使用底层列"""
+    if isinstance(table, ColumnTable):
+        return table.column(name)
+    return [getattr(row, name) for row in table]
+
+
+def glob_prefix_parts(pattern: str) -> List[str]:
+    """glob 模式中第一个通配符之前的完整目录部分，例如 Assets/Art/Spine/** -> [Assets, Art, Spine]"""
+    literal = re.split(r"[*?\[]", pattern, 1)[0]
+    return literal.split("/")[:-1]
+
+
+class PathTrie:
+    """资源路径的目录前缀树，每个节点保存直接位于该目录下的资源 id"""
+
+    __slots__ = ("children", "asset_ids")
+
+    def __init__(self):
+        self.children: Dict[str, "PathTrie"] = {}
+        self.asset_ids: List[int] = []
+
+    def insert(self, path: str, asset_id: int):
+        node = self
+        for part in path.split("/")[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = PathTrie()
+            node = child
+        node.asset_ids.append(asset_id)
+
+    def find(self, parts: List[str]) -> Optional["PathTrie"]:
+        node = self
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def collect(self) -> List[int]:
+        """子树中的所有资源 id"""
+        asset_ids = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            asset_ids.extend(node.asset_ids)
+            stack.extend(node.children.values())
+        return asset_ids
+
+
+class ManifestIndex:
+    """为单个清单预先建立的查询索引
+
+    bundle_deps 为资源包依赖邻接表：bundle_id -> 直接依赖的 bundle_id
+    （2.0.0 为 depend_ids，2.3.1+ 为 depend_bundle_ids；1.5.2 的资源自带完整依赖列表）。
+    标签倒排索引和路径前缀树在第一次使用时构建。
+    """
+
+    def __init__(self, manifest: Any):
+        self.manifest = manifest
+        self.bundle_deps = [
+            tuple(bundle.depend_bundle_ids or bundle.depend_ids)
+            for bundle in manifest.bundle_list
+        ]
+        self._tag_index: Optional[Dict[str, Set[int]]] = None
+        self._path_trie: Optional[PathTrie] = None
+        self._asset_paths: Optional[list] = None
+
+    @property
+    def tag_index(self) -> Dict[str, Set[int]]:
+        """标签 -> bundle_id（资源包自身的 tags 以及其中资源的 asset_tags）"""
+        if self._tag_index is None:
+            index: Dict[str, Set[int]] = {}
+            for bundle_id, tags in enumerate(
+                table_column(self.manifest.bundle_list, "tags")
+            ):
+                for tag in tags:
+                    index.setdefault(tag, set()).add(bundle_id)
+            assets = self.manifest.asset_list
+            for bundle_id, tags in zip(
+                table_column(assets, "bundle_id"), table_column(assets, "asset_tags")
+            ):
+                for tag in tags:
+                    index.setdefault(tag, set()).add(bundle_id)
+            self._tag_index = index
+        return self._tag_index
+
+    @property
+    def path_trie(self) -> PathTrie:
+        if self._path_trie is None:
+            trie = PathTrie()
+            for asset_id, asset_path in enumerate(self.asset_paths):
+                trie.insert(asset_path, asset_id)
+            self._path_trie = trie
+        return self._path_trie
+
+    @property
+    def asset_paths(self) -> list:
+        if self._asset_paths is None:
+            self._asset_paths = table_column(self.manifest.asset_list, "asset_path")
+        return self._asset_paths
+
+    def match_tags(self, patterns: List[str]) -> Set[int]:
+        """返回带有匹配标签的 bundle_id"""
+        match = compile_globs(patterns)
+        bundle_ids = set()
+        for tag, tag_bundle_ids in self.tag_index.items():
+            if match(tag):
+                bundle_ids |= tag_bundle_ids
+        return bundle_ids
+
+    def match_paths(self, patterns: List[str]) -> List[int]:
+        """先按模式的目录前缀在前缀树中定位，再对子树中的资源路径做 glob 匹配"""
+        asset_paths = self.asset_paths
+        asset_ids = set()
+        for pattern in patterns:
+            node = self.path_trie.find(glob_prefix_parts(pattern))
+            if node is None:
+                continue
+            match = compile_globs([pattern])
+            asset_ids.update(
+                asset_id
+                for asset_id in node.collect()
+                if match(asset_paths[asset_id])
+            )
+        return sorted(asset_ids)
+
+    def match_assets(
+        self,
+        asset_patterns: Optional[List[str]] = None,
+        address_patterns: Optional[List[str]] = None,
+    ) -> List[int]:
+        """返回资源路径或地址匹配任一模式的资源 id"""
+        match_path = compile_globs(asset_patterns) if asset_patterns else None
+        match_address = compile_globs(address_patterns) if address_patterns else None
+        asset_ids = []
+        for asset_id, asset in enumerate(self.manifest.asset_list):
+            if (match_path and match_path(asset.asset_path)) or (
+                match_address and match_address(asset.address)
+            ):
+                asset_ids.append(asset_id)
+        return asset_ids
+
+    def asset_bundle_ids(self, asset_ids: List[int]) -> Set[int]:
+        """资源所在的资源包以及资源直接记录的依赖资源包"""
+        bundle_ids = set()
+        assets = self.manifest.asset_list
+        for asset_id in asset_ids:
+            asset = assets[asset_id]
+            bundle_ids.add(asset.bundle_id)
+            bundle_ids.update(asset.depend_bundle_ids or asset.depend_ids)
+        return bundle_ids
+
+    def dependency_closure(self, bundle_ids: Set[int]) -> Set[int]:
+        """沿邻接表求资源包的传递依赖闭包"""
+        count = len(self.bundle_deps)
+        closure = set()
+        stack = list(bundle_ids)
+        while stack:
+            bundle_id = stack.pop()
+            if bundle_id in closure or not 0 <= bundle_id < count:
+                continue
+            closure.add(bundle_id)
+            stack.extend(self.bundle_deps[bundle_id])
+        return closure
+
+
+def select_indexed_bundles(
+    bundles_map: Dict[str, Any], manifests: List[Any], options: ExtractOptions
+) -> Dict[str, Any]:
+    """只保留选择器匹配的资源包及其依赖闭包
+
+    --asset / --address、--tag、--path 各自得到一组 bundle_id，同时给出多种时取交集。
+    """
+    selected_hashes = set()
+    matched_bundles = 0
+    for manifest in manifests:
+        index = ManifestIndex(manifest)
+        selections = []
+        if options.assets or options.addresses:
+            asset_ids = index.match_assets(options.assets, options.addresses)
+            selections.append(index.asset_bundle_ids(asset_ids))
+        if options.tags:
+            selections.append(index.match_tags(options.tags))
+        if options.paths:
+            selections.append(index.asset_bundle_ids(index.match_paths(options.paths)))
+
+        bundle_ids = set.intersection(*selections)
+        matched_bundles += len(bundle_ids)
+        bundle_list = manifest.bundle_list
+        for bundle_id in index.dependency_closure(bundle_ids):
+            selected_hashes.add(bundle_list[bundle_id].file_hash)
+
+    selected = {
+        file_hash: bundle
+        for file_hash, bundle in bundles_map.items()
+        if file_hash in selected_hashes
+    }
+    print(f"匹配到 {matched_bundles} 个资源包，加上依赖共 {len(selected)} 个资源包")
+    return selected
+
+
+def select_changed_bundles(
+    bundles_map: Dict[str, Any], old_path: Path
+) -> Dict[str, Any]:
+    """只保留相对旧版本新增或变更的资源包"""
+    old_index = load_bundle_index(old_path)
+    selected = {}
+    for file_hash, bundle in bundles_map.items():
+        old_bundle = old_index.get(bundle.bundle_name)
+        if old_bundle is None or bundle_changed(old_bundle, bundle):
+            selected[file_hash] = bundle
+    print(f"与旧版本相比新增或变更的资源包: {len(selected)} / {len(bundles_map)}")
+    return selected
+
+
+def select_bundles(
+    bundles_map: Dict[str, Any],
+    options: ExtractOptions,
+    manifests: Optional[List[Any]] = None,
+) -> Dict[str, Any]:
+    """按提取选项筛选要输出的资源包（file_hash -> 资源包）"""
+    if options.selects_bundles():
+        bundles_map = select_indexed_bundles(bundles_map, manifests or [], options)
+    if options.only_changed:
+        bundles_map = select_changed_bundles(bundles_map, Path(options.only_changed))
+    return bundles_map
+
+
+OUTPUT_MODES = ["copy", "hardlink", "reflink", "move"]
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """尝试 FICLONE 写时复制克隆，不支持时退回 os.copy_file_range（内核内复制）"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+
+        if not hasattr(os, "copy_file_range"):
+            return False
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            return False
+        return remaining == 0
+
+
+def materialize_file(src: Path, dst: Path, mode: str = "copy"):
+    """按输出方式把缓存文件放到目标路径，不支持时退回 shutil.copy2
+
+    hardlink 仅在源和目标位于同一文件系统时使用 os.link；move 会移走源文件。
+    已存在的目标文件先删除（可能是之前 hardlink 输出时与源文件共用的 inode）。
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+
+    if mode == "hardlink":
+        if os.stat(src).st_dev == os.stat(os.path.dirname(dst)).st_dev:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+    elif mode == "move":
+        shutil.move(src, dst)
+        return
+    elif mode == "reflink":
+        if _reflink(src, dst):
+            shutil.copystat(src, dst)
+            return
+
+    shutil.copy2(src, dst)
+
+
+def materialize_bundles(
+    jobs: Dict[Path, Any], copy_func, workers: int = 8, verify_func=None
+) -> Tuple[int, int, Dict[Path, str], Dict[Path, str]]:
+    """在线程池中输出所有资源包，单个资源包输出失败不会中断其余资源包
+
+    Args:
+        jobs: 目标路径 -> 源（传给 copy_func 的第一个参数）
+        copy_func: copy_func(源, 目标路径)
+        workers: 线程数
+        verify_func: verify_func(目标路径, 文件大小)，返回问题描述或 None；
+            在同一个线程中紧接着复制执行，读取的数据仍在页缓存中
+
+    Returns:
+        (成功的文件数, 字节数, 目标路径 -> 校验问题, 目标路径 -> 输出错误)
+    """
+    start = time.perf_counter()
+
+    # 每个不同的输出目录只创建一次
+    for directory in sorted({target.parent for target in jobs}):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def run(item) -> Tuple[int, Optional[str], Optional[str]]:
+        target_file, source = item
+        try:
+            copy_func(source, target_file)
+            size = os.path.getsize(target_file)
+        except Exception as e:
+            return 0, None, f"{type(e).__name__}: {e}"
+        return size, verify_func(target_file, size) if verify_func else None, None
+
+    total_bytes = 0
+    problems = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for target_file, (size, problem, error) in zip(
+            jobs, pool.map(run, jobs.items())
+        ):
+            total_bytes += size
+            if problem:
+                problems[target_file] = problem
+            if error:
+                errors[target_file] = error
+
+    count = len(jobs) - len(errors)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"总共提取了 {count} 个文件")
+    print(
+        f"耗时 {elapsed:.2f} 秒，{count / elapsed:.1f} 个文件/秒，"
+        f"{total_bytes / 1024 / 1024 / elapsed:.2f} MB/秒"
+    )
+    if errors:
+        print(f"{len(errors)} 个资源包输出失败:")
+        for target_file, error in errors.items():
+            print(f"  {target_file}: {error}")
+    return count, total_bytes, problems, errors
+
 
-def extract_apk_assets(root_path: Path, bytes_files: List[Path], output_dir: Path):
+VERIFY_MODES = ["size", "crc"]
+VERIFY_REPORT_NAME = "VerifyReport.json"
+
+
+# FileCRC 为 UInt32 的清单版本；更早版本的 FileCRC 字符串格式不确定，不校验 CRC
+NUMERIC_CRC_VERSIONS = ["2025.8.28", "2025.9.30"]
+
+
+def numeric_crc_hashes(manifests: List[Any]) -> Set[str]:
+    """FileCRC 为 UInt32 的清单中的所有 file_hash"""
+    hashes = set()
+    for manifest in manifests:
+        if manifest.file_version in NUMERIC_CRC_VERSIONS:
+            hashes.update(table_column(manifest.bundle_list, "file_hash"))
+    return hashes
+
+
+def file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def verify_bundle_file(
+    path: Path, size: int, bundle: Any, check_crc: bool = False
+) -> Optional[str]:
+    """先比较大小，需要时再流式计算 CRC32，返回问题描述或 None
+
+    check_crc 只应对 NUMERIC_CRC_VERSIONS 清单中的资源包使用。
+    """
+    if size != bundle.file_size:
+        return f"大小不符: {size} != {bundle.file_size}"
+    if check_crc:
+        expected = int(bundle.file_crc)
+        crc = file_crc32(path)
+        if crc != expected:
+            return f"CRC 不符: {crc} != {expected}"
+    return None
+
+
+def save_verify_report(
+    path: Path,
+    corrupt: List[Dict[str, Any]],
+    missing: List[Dict[str, Any]],
+    failed: List[Dict[str, Any]],
+    crc_unchecked: List[Dict[str, Any]],
+):
+    print(
+        f"校验结果: 损坏 {len(corrupt)} 个，缺失 {len(missing)} 个，"
+        f"输出失败 {len(failed)} 个资源包"
+    )
+    for item in corrupt:
+        print(f"  损坏 {item['bundle_name']}: {item['problem']}")
+    if crc_unchecked:
+        print(
+            f"{len(crc_unchecked)} 个资源包的清单早于 2025.8.28（FileCRC 不是 UInt32），只校验了大小，未校验 CRC"
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "corrupt": corrupt,
+                "missing": missing,
+                "failed": failed,
+                "crc_unchecked": crc_unchecked,
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    print(f"校验报告已保存到: {path}")
+
+
+STATE_FILE_NAME = ".yooasset_state.db"
+
+
+class ExtractState:
+    """输出目录中的提取状态：file_hash + 输出路径 -> 大小、修改时间
+
+    再次运行时，输出文件仍存在且大小和修改时间与记录一致的资源包直接跳过，不读取源文件。
+    """
+
+    def __init__(self, path: Path, force: bool = False):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS bundles ("
+            "file_hash TEXT NOT NULL, output_path TEXT NOT NULL, "
+            "size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "PRIMARY KEY (file_hash, output_path))"
+        )
+        if force:
+            self.conn.execute("DELETE FROM bundles")
+        self.conn.commit()
+        self.entries = {
+            (file_hash, output_path): (size, mtime_ns)
+            for file_hash, output_path, size, mtime_ns in self.conn.execute(
+                "SELECT file_hash, output_path, size, mtime_ns FROM bundles"
+            )
+        }
+
+    def is_current(self, file_hash: str, target_file: Path) -> bool:
+        entry = self.entries.get((file_hash, str(target_file)))
+        if entry is None:
+            return False
+        try:
+            st = os.stat(target_file)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == entry
+
+    def record(self, outputs: Dict[Path, str]):
+        """记录已输出的文件（目标路径 -> file_hash）"""
+        rows = []
+        for target_file, file_hash in outputs.items():
+            st = os.stat(target_file)
+            rows.append((file_hash, str(target_file), st.st_size, st.st_mtime_ns))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO bundles VALUES (?, ?, ?, ?)", rows
+            )
+
+    def forget(self, targets: List[Path]):
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM bundles WHERE output_path = ?",
+                [(str(target_file),) for target_file in targets],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def output_bundles(
+    jobs: Dict[Path, Tuple[Any, Any]],
+    copy_func,
+    output_dir: Path,
+    options: ExtractOptions,
+    bundles_map: Optional[Dict[str, Any]] = None,
+    manifests: Optional[List[Any]] = None,
+):
+    """跳过提取状态中未变化的资源包，输出其余资源包并更新状态
+
+    Args:
+        jobs: 目标路径 -> (资源包, 源)
+        bundles_map: 需要输出的全部资源包（file_hash -> 资源包），校验时用于报告缺失
+        manifests: 资源包所属的清单，--verify crc 时用于判断 FileCRC 格式
+    """
+    verify_func = None
+    check_crc = options.verify == "crc"
+    crc_hashes = numeric_crc_hashes(manifests or []) if check_crc else set()
+    if options.verify:
+
+        def verify_func(target_file: Path, size: int) -> Optional[str]:
+            bundle = jobs[target_file][0]
+            return verify_bundle_file(
+                target_file, size, bundle, check_crc and bundle.file_hash in crc_hashes
+            )
+
+    state = ExtractState(output_dir / STATE_FILE_NAME, options.force)
+    try:
+        pending = {}
+        for target_file, (bundle, source) in jobs.items():
+            if not state.is_current(bundle.file_hash, target_file):
+                pending[target_file] = source
+
+        skipped = len(jobs) - len(pending)
+        if skipped:
+            print(f"跳过 {skipped} 个未变化的资源包（使用 --force 重新提取）")
+
+        _, _, problems, errors = materialize_bundles(
+            pending, copy_func, options.workers, verify_func
+        )
+
+        if verify_func and skipped:
+            # 跳过的资源包也要校验（例如之前只校验了大小）
+            current = [target_file for target_file in jobs if target_file not in pending]
+            with ThreadPoolExecutor(max_workers=max(1, options.workers)) as pool:
+                results = pool.map(
+                    lambda target_file: verify_func(
+                        target_file, os.path.getsize(target_file)
+                    ),
+                    current,
+                )
+                for target_file, problem in zip(current, results):
+                    if problem:
+                        problems[target_file] = problem
+            state.forget([target_file for target_file in current if target_file in problems])
+
+        # 输出或校验失败的资源包不记录状态，下次运行时重新输出
+        state.record(
+            {
+                target_file: jobs[target_file][0].file_hash
+                for target_file in pending
+                if target_file not in problems and target_file not in errors
+            }
+        )
+    finally:
+        state.close()
+
+    if options.verify:
+        corrupt = [
+            {
+                "bundle_name": jobs[target_file][0].bundle_name,
+                "file_hash": jobs[target_file][0].file_hash,
+                "problem": problem,
+            }
+            for target_file, problem in problems.items()
+        ]
+        found = {bundle.file_hash for bundle, _ in jobs.values()}
+        missing = [
+            {"bundle_name": bundle.bundle_name, "file_hash": file_hash}
+            for file_hash, bundle in (bundles_map or {}).items()
+            if file_hash not in found
+        ]
+        # 找到了源文件但没有成功写出的资源包
+        failed = [
+            {
+                "bundle_name": jobs[target_file][0].bundle_name,
+                "file_hash": jobs[target_file][0].file_hash,
+                "error": error,
+            }
+            for target_file, error in errors.items()
+        ]
+        crc_unchecked = [
+            {"bundle_name": bundle.bundle_name, "file_hash": bundle.file_hash}
+            for bundle, _ in jobs.values()
+            if check_crc and bundle.file_hash not in crc_hashes
+        ]
+        save_verify_report(
+            output_dir / VERIFY_REPORT_NAME, corrupt, missing, failed, crc_unchecked
+        )
+
+
+def find_cache_roots(bytes_files: List[Path]) -> List[Path]:
+    """根据清单位置推断缓存目录：Package/ManifestFiles/*.bytes 对应 Package/CacheBundleFiles"""
+    cache_roots = []
+    for bytes_file in bytes_files:
+        cache_root = bytes_file.parent.parent / "CacheBundleFiles"
+        if cache_root not in cache_roots and cache_root.is_dir():
+            cache_roots.append(cache_root)
+    return cache_roots
+
+
+def locate_cached_bundles(
+    bundles_map: Dict[str, PackageBundle], cache_roots: List[Path]
+) -> Dict[str, str]:
+    """按 YooAsset 的缓存布局直接拼出每个资源包的 __data 路径并检查是否存在
+
+    布局为 CacheBundleFiles/{hash前2位}/{hash}/__data（部分旧版本没有前缀目录），
+    每个资源包只需要几次 stat，而不用遍历整个目录树。
+    """
+    found = {}
+    roots = [str(root) for root in cache_roots]
+    for file_hash in bundles_map:
+        if not file_hash:
+            continue
+        for root in roots:
+            for data_path in (
+                os.path.join(root, file_hash[:2], file_hash, "__data"),
+                os.path.join(root, file_hash, "__data"),
+            ):
+                if os.path.isfile(data_path):
+                    found[file_hash] = data_path
+                    break
+            if file_hash in found:
+                break
+    return found
+
+
+def walk_cached_bundles(
+    root_path: Path, bundles_map: Dict[str, PackageBundle]
+) -> Dict[str, Path]:
+    """遍历目录查找 {hash}/__data（用于未知的缓存布局）"""
+    found = {}
+    for data_file_path in root_path.rglob("__data"):
+        if not data_file_path.is_file():
+            continue
+        file_hash = data_file_path.parent.name
+        if file_hash in bundles_map and file_hash not in found:
+            found[file_hash] = data_file_path
+    return found
+
+
+def extract_apk_assets(
+    root_path: Path,
+    bytes_files: List[Path],
+    output_dir: Path,
+    options: Optional[ExtractOptions] = None,
+):
+    options = options or ExtractOptions()
 
     apk_dir = output_dir / "Apk"
     apk_dir.mkdir(parents=True, exist_ok=True)
 
     buildin_catalogs = {}
     all_bundles = {}
-
-    for bytes_file in bytes_files:
-        manifest = process_manifest_file(bytes_file, output_dir, buildin_catalogs)
-        if manifest:
-            for bundle in manifest.bundle_list:
-                all_bundles[bundle.file_hash] = bundle
+    manifests = []
+    with open_manifest_database(options.sqlite) as database:
+        for bytes_file in bytes_files:
+            manifest = process_manifest_file(
+                bytes_file,
+                output_dir,
+                buildin_catalogs,
+                options.columnar,
+                options.bundles_only,
+                options.json_format,
+                options.json_compact,
+                database=database,
+            )
+            if manifest:
+                manifests.append(manifest)
+                for bundle in manifest.bundle_list:
+                    all_bundles[bundle.file_hash] = bundle
 
     if buildin_catalogs:
         catalog_json_path = output_dir / "BuildinCatalog.json"
         save_buildin_catalogs_to_json(buildin_catalogs, catalog_json_path)
 
-    bundle_files_found = 0
+    all_bundles = select_bundles(all_bundles, options, manifests)
+
+    jobs = {}
     for file_path in root_path.rglob("*"):
         if file_path.is_file() and file_path.stem in all_bundles:
             bundle = all_bundles[file_path.stem]
             target_path_str = convert_bundle_name_to_path(bundle.bundle_name)
 
             if target_path_str:
-                target_file = apk_dir / target_path_str
-                target_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(file_path, target_file)
-                bundle_files_found += 1
+                jobs[apk_dir / target_path_str] = (bundle, file_path)
+
+    output_bundles(
+        jobs,
+        lambda src, dst: materialize_file(src, dst, options.output_mode),
+        output_dir,
+        options,
+        all_bundles,
+        manifests,
+    )
+
+
+ARCHIVE_SUFFIXES = [".apk", ".xapk", ".zip"]
+
+
+class FileWindow(io.RawIOBase):
+    """文件中 [start, start + size) 的只读窗口，用来直接打开未压缩存储的嵌套 APK"""
+
+    def __init__(self, fp, start: int, size: int):
+        self.fp = fp
+        self.start = start
+        self.size = size
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.pos = max(0, offset)
+        return self.pos
 
-    print(f"总共提取了 {bundle_files_found} 个文件")
+    def tell(self) -> int:
+        return self.pos
 
+    def readinto(self, b) -> int:
+        n = min(len(b), self.size - self.pos)
+        if n <= 0:
+            return 0
+        self.fp.seek(self.start + self.pos)
+        n = self.fp.readinto(memoryview(b)[:n])
+        self.pos += n
+        return n
 
-def extract_hotfix_assets(root_path: Path, bytes_files: List[Path], output_dir: Path):
+
+def member_data_offset(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> int:
+    """成员数据在压缩包文件中的起始位置（跳过本地文件头）"""
+    archive.fp.seek(info.header_offset)
+    header = archive.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack_from("<HH", header, 26)
+    return info.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+
+def has_assets(zf: zipfile.ZipFile) -> bool:
+    return any(name.startswith("assets/") for name in zf.namelist())
+
+
+def open_apk_archives(
+    archive: zipfile.ZipFile, stack: ExitStack
+) -> List[zipfile.ZipFile]:
+    """返回压缩包本身以及其中含有 assets/ 的嵌套 .apk（XAPK 中的 base/split APK）
+
+    未压缩存储的嵌套 APK 通过外层文件的窗口直接读取。压缩存储的先在解压流上读取目录，
+    没有 assets/ 的（例如 config split）直接跳过；其余写到临时文件再打开：直接在
+    ZipExtFile 上随机读取时，每次向后 seek 都要从头重新解压，多线程交错读取会非常慢。
+    打开的文件和嵌套压缩包由 stack 负责关闭。
+    """
+    archives = [archive]
+    for info in archive.infolist():
+        if not info.filename.lower().endswith(".apk"):
+            continue
+        if info.compress_type == zipfile.ZIP_STORED and archive.filename:
+            start = member_data_offset(archive, info)
+            fp = stack.enter_context(open(archive.filename, "rb"))
+            nested = zipfile.ZipFile(FileWindow(fp, start, info.file_size))
+            if has_assets(nested):
+                archives.append(stack.enter_context(nested))
+            else:
+                nested.close()
+            continue
+        with archive.open(info) as src, zipfile.ZipFile(src) as nested:
+            if not has_assets(nested):
+                continue
+        spool = stack.enter_context(tempfile.TemporaryFile())
+        with archive.open(info) as src:
+            shutil.copyfileobj(src, spool, 1024 * 1024)
+        spool.seek(0)
+        archives.append(stack.enter_context(zipfile.ZipFile(spool)))
+    return archives
+
+
+def copy_archive_member(
+    entry: Tuple[zipfile.ZipFile, zipfile.ZipInfo], target_file: Path
+):
+    """把压缩包中的成员流式写到目标文件"""
+    zf, info = entry
+    with zf.open(info) as src, open(target_file, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def is_manifest_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> bool:
+    """只读取前 4 字节判断 .bytes 成员是否为清单或 BuildinCatalog"""
+    with zf.open(info) as f:
+        head = f.read(4)
+    return len(head) == 4 and _UINT32.unpack(head)[0] in (
+        MANIFEST_FILE_SIGN,
+        BUILDIN_CATALOG_FILE_SIGN,
+    )
+
+
+def extract_archive_assets(
+    archive_path: Path, output_dir: Path, options: Optional[ExtractOptions] = None
+):
+    """直接从 APK / XAPK / ZIP 中读取清单和资源包，不解压整个安装包
+
+    assets/ 下文件头为清单或 BuildinCatalog 的 .bytes 在内存中反序列化，其余成员（包括
+    以 .bytes 存储的原始资源包）按 文件名(不含扩展名) -> 成员 的索引一次查找后流式写出。
+    """
+    options = options or ExtractOptions()
+
+    apk_dir = output_dir / "Apk"
+    apk_dir.mkdir(parents=True, exist_ok=True)
+
+    buildin_catalogs = {}
+    all_bundles = {}
+    manifests = []
+    member_index: Dict[str, Tuple[zipfile.ZipFile, zipfile.ZipInfo]] = {}
+
+    with zipfile.ZipFile(archive_path) as archive, ExitStack() as stack:
+        archives = open_apk_archives(archive, stack)
+        database = stack.enter_context(open_manifest_database(options.sqlite))
+        for zf in archives:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.startswith("assets/"):
+                    continue
+                member = PurePosixPath(info.filename)
+                if member.suffix == ".bytes" and is_manifest_member(zf, info):
+                    manifest = process_manifest_file(
+                        member,
+                        output_dir,
+                        buildin_catalogs,
+                        options.columnar,
+                        options.bundles_only,
+                        options.json_format,
+                        options.json_compact,
+                        data=zf.read(info),
+                        database=database,
+                    )
+                    if manifest:
+                        manifests.append(manifest)
+                        for bundle in manifest.bundle_list:
+                            all_bundles[bundle.file_hash] = bundle
+                else:
+                    member_index.setdefault(member.stem, (zf, info))
+
+        if buildin_catalogs:
+            catalog_json_path = output_dir / "BuildinCatalog.json"
+            save_buildin_catalogs_to_json(buildin_catalogs, catalog_json_path)
+
+        all_bundles = select_bundles(all_bundles, options, manifests)
+
+        jobs = {}
+        for file_hash, bundle in all_bundles.items():
+            entry = member_index.get(file_hash)
+            target_path_str = convert_bundle_name_to_path(bundle.bundle_name)
+            if entry is not None and target_path_str:
+                jobs[apk_dir / target_path_str] = (bundle, entry)
+
+        output_bundles(
+            jobs, copy_archive_member, output_dir, options, all_bundles, manifests
+        )
+
+
+def extract_hotfix_assets(
+    root_path: Path,
+    bytes_files: List[Path],
+    output_dir: Path,
+    options: Optional[ExtractOptions] = None,
+):
+    options = options or ExtractOptions()
 
     update_dir = output_dir / "Update"
     update_dir.mkdir(parents=True, exist_ok=True)
 
     buildin_catalogs = {}
     all_bundles_map = {}
-
-    for bytes_file in bytes_files:
-        manifest = process_manifest_file(bytes_file, output_dir, buildin_catalogs)
-        if not manifest:
-            continue
-        for bundle in manifest.bundle_list:
-            all_bundles_map[bundle.file_hash] = bundle
+    manifests = []
+    # 每个清单对应的 (清单文件, file_hash 列表)，按清单分别定位缓存目录
+    manifest_hashes: List[Tuple[Path, List[str]]] = []
+    with open_manifest_database(options.sqlite) as database:
+        for bytes_file in bytes_files:
+            manifest = process_manifest_file(
+                bytes_file,
+                output_dir,
+                buildin_catalogs,
+                options.columnar,
+                options.bundles_only,
+                options.json_format,
+                options.json_compact,
+                database=database,
+            )
+            if not manifest:
+                continue
+            manifests.append(manifest)
+            hashes = []
+            for bundle in manifest.bundle_list:
+                all_bundles_map[bundle.file_hash] = bundle
+                hashes.append(bundle.file_hash)
+            manifest_hashes.append((bytes_file, hashes))
 
     if buildin_catalogs:
         catalog_json_path = output_dir / "BuildinCatalog.json"
@@ -648,38 +2261,203 @@ def extract_hotfix_assets(root_path: Path, bytes_files: List[Path], output_dir:
         print("\n所有清单均未包含任何资源包信息，提取结束")
         return
 
-    files_extracted = 0
-    found_hashes = set()
+    all_bundles_map = select_bundles(all_bundles_map, options, manifests)
+    if not all_bundles_map:
+        print("没有需要提取的资源包")
+        return
 
-    for data_file_path in root_path.rglob("__data"):
-        if not data_file_path.is_file():
+    cached_files = {}
+    unresolved = {}
+    for bytes_file, hashes in manifest_hashes:
+        wanted = {
+            file_hash: all_bundles_map[file_hash]
+            for file_hash in hashes
+            if file_hash in all_bundles_map
+        }
+        if not wanted:
             continue
+        found = locate_cached_bundles(wanted, find_cache_roots([bytes_file]))
+        if found:
+            cached_files.update(found)
+        else:
+            unresolved.update(wanted)
+
+    # 只对在同级 CacheBundleFiles 中一个都没找到的清单遍历整个目录
+    unresolved = {
+        file_hash: bundle
+        for file_hash, bundle in unresolved.items()
+        if file_hash not in cached_files
+    }
+    if unresolved:
+        print(
+            f"{len(unresolved)} 个资源包未在 CacheBundleFiles 中直接找到，回退为遍历整个目录"
+        )
+        cached_files.update(walk_cached_bundles(root_path, unresolved))
+
+    jobs = {}
+    for file_hash, data_file_path in cached_files.items():
+        bundle = all_bundles_map[file_hash]
+        target_path_str = convert_bundle_name_to_path(bundle.bundle_name)
+
+        if target_path_str:
+            jobs[update_dir / target_path_str] = (bundle, data_file_path)
+
+    output_bundles(
+        jobs,
+        lambda src, dst: materialize_file(src, dst, options.output_mode),
+        output_dir,
+        options,
+        all_bundles_map,
+        manifests,
+    )
 
-        parent_dir = data_file_path.parent
-        file_hash = parent_dir.name
 
-        if file_hash in all_bundles_map and file_hash not in found_hashes:
-            bundle = all_bundles_map[file_hash]
-            target_path_str = convert_bundle_name_to_path(bundle.bundle_name)
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="YooAsset 资源提取")
+    parser.add_argument("input", help="输入目录，或 .apk / .xapk / .zip 安装包")
+    parser.add_argument(
+        "--columnar", action="store_true", help="使用列式存储解析清单，降低大型清单的内存占用"
+    )
+    parser.add_argument(
+        "--bundles-only",
+        action="store_true",
+        help="只解析Bundle列表（跳过资源表，导出的JSON中 asset_list 为空）",
+    )
+    parser.add_argument(
+        "--json-format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="清单导出格式：json（默认）或 ndjson（每行一条记录）",
+    )
+    parser.add_argument("--compact", action="store_true", help="导出 JSON 时不缩进")
+    parser.add_argument(
+        "--output-mode",
+        choices=OUTPUT_MODES,
+        default="copy",
+        help="资源包输出方式：copy（默认）、hardlink（同一文件系统时硬链接）、"
+        "reflink（写时复制克隆，不支持时使用 copy_file_range）、move（移动源文件）",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=8, help="输出资源包的线程数（默认 8）"
+    )
+    parser.add_argument(
+        "--only-changed",
+        metavar="OLD",
+        help="只提取相对旧版本（清单 .bytes 文件或目录）新增和变更的资源包",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"忽略输出目录中的提取状态（{STATE_FILE_NAME}），重新输出所有资源包",
+    )
+    parser.add_argument(
+        "--verify",
+        choices=VERIFY_MODES,
+        help=f"校验输出的资源包：size 只比较大小，crc 再计算 CRC32；结果写入 {VERIFY_REPORT_NAME}",
+    )
+    parser.add_argument(
+        "--asset",
+        action="append",
+        metavar="PATTERN",
+        help="只提取资源路径匹配的资源（支持 glob，可重复）及其依赖的资源包",
+    )
+    parser.add_argument(
+        "--address",
+        action="append",
+        metavar="PATTERN",
+        help="只提取可寻址地址匹配的资源（支持 glob，可重复）及其依赖的资源包",
+    )
+    parser.add_argument(
+        "--tag",
+        action="append",
+        metavar="TAG",
+        help="只提取带有该标签（资源包 tags 或资源 asset_tags，支持 glob，可重复）的资源包",
+    )
+    parser.add_argument(
+        "--path",
+        action="append",
+        metavar="PATTERN",
+        help='只提取路径匹配的资源所在的资源包，例如 "Assets/Art/Spine/**"（可重复）',
+    )
+    parser.add_argument(
+        "--sqlite",
+        metavar="DB",
+        help="同时把清单（包、资源、资源包、标签、依赖关系）导出到 SQLite 数据库",
+    )
+    return parser
 
-            if target_path_str:
-                target_file = update_dir / target_path_str
-                target_file.parent.mkdir(parents=True, exist_ok=True)
 
-                shutil.copy2(data_file_path, target_file)
-                files_extracted += 1
-                found_hashes.add(file_hash)
+def build_diff_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="YooAssetUnpacker.py diff",
+        description="按 bundle_name 与 file_hash/file_crc 对比两个版本的资源包",
+    )
+    parser.add_argument("old", help="旧版本清单 .bytes 文件或目录（缓存目录）")
+    parser.add_argument("new", help="新版本清单 .bytes 文件或目录（缓存目录）")
+    parser.add_argument("-o", "--output", help="把差异写入 JSON 文件，而不是逐行打印")
+    return parser
+
+
+def run_diff(argv: List[str]):
+    args = build_diff_parser().parse_args(argv)
+    old_path, new_path = Path(args.old), Path(args.new)
+    for path in (old_path, new_path):
+        if not path.exists():
+            print(f"错误: '{path}' 不存在")
+            sys.exit(1)
+
+    diff = diff_bundle_indexes(load_bundle_index(old_path), load_bundle_index(new_path))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(asdict(diff), f, ensure_ascii=False, indent=2)
+        print(f"差异已保存到: {args.output}")
+    else:
+        for prefix, names in (("+", diff.added), ("~", diff.changed), ("-", diff.removed)):
+            for name in names:
+                print(f"{prefix} {name}")
 
-    print(f"总共提取了 {files_extracted} 个文件")
+    print(
+        f"新增 {len(diff.added)} 个，变更 {len(diff.changed)} 个，删除 {len(diff.removed)} 个资源包"
+    )
 
 
 def main():
 
-    if len(sys.argv) != 2:
-        print("用法: python Extract.py 输入目录")
-        sys.exit(1)
+    if len(sys.argv) > 1 and sys.argv[1] == "diff":
+        run_diff(sys.argv[2:])
+        return
+
+    args = build_arg_parser().parse_args()
+    options = ExtractOptions(
+        columnar=args.columnar,
+        bundles_only=args.bundles_only,
+        json_format=args.json_format,
+        json_compact=args.compact,
+        output_mode=args.output_mode,
+        workers=args.workers,
+        only_changed=args.only_changed,
+        force=args.force,
+        verify=args.verify,
+        assets=args.asset,
+        addresses=args.address,
+        tags=args.tag,
+        paths=args.path,
+        sqlite=args.sqlite,
+    )
+    if options.bundles_only and options.selects_assets():
+        print("按资源或标签筛选需要解析资源表，忽略 --bundles-only")
+        options.bundles_only = False
 
-    input_path = Path(sys.argv[1])
+    input_path = Path(args.input)
+
+    script_dir = Path(__file__).parent
+    output_dir = script_dir
+
+    if input_path.is_file() and input_path.suffix.lower() in ARCHIVE_SUFFIXES:
+        print(f"检测到: 安装包 {input_path.name}，直接读取其中的资产")
+        extract_archive_assets(input_path, output_dir, options)
+        return
 
     if not input_path.exists() or not input_path.is_dir():
         print(f"错误: 输入目录 '{input_path}' 不存在或不是目录")
@@ -691,15 +2469,12 @@ def main():
         print("未找到 .bytes 文件")
         sys.exit(1)
 
-    script_dir = Path(__file__).parent
-    output_dir = script_dir
-
     if asset_type == "apk":
         print(f"检测到: APK 资产 ({len(bytes_files)} 个清单文件)")
-        extract_apk_assets(input_path, bytes_files, output_dir)
+        extract_apk_assets(input_path, bytes_files, output_dir, options)
     elif asset_type == "hotfix":
         print(f"检测到: 热更资产 ({len(bytes_files)} 个清单文件)")
-        extract_hotfix_assets(input_path, bytes_files, output_dir)
+        extract_hotfix_assets(input_path, bytes_files, output_dir, options)
 
 
 if __name__ == "__main__":